@@ -33,6 +33,19 @@ class CodeEncoder(JSONEncoder):
         return obj.__dict__
 
 
+def slot_fields_str(obj: SourceTerm | StatementTerm | DataTerm) -> str:
+    """Строковое представление заданных (не None) полей структуры с `__slots__` в порядке их объявления.
+
+    Структуры термов трансляции не имеют `__dict__`, поэтому поля перечисляются по `__slots__`.
+    """
+    fields: dict[str, Any] = {}
+    for key in obj.__slots__:
+        value: Any = getattr(obj, key)
+        if value is not None:
+            fields[key] = value
+    return fields.__str__()
+
+
 class Opcode(str, Enum):
     """Opcode инструкций языка.
 
@@ -147,6 +160,8 @@ class SourceTerm:
     line: int
     terms: list[str]
 
+    __slots__ = ("line", "terms")
+
     def __init__(self, line_num: int, line_split: list[str]) -> None:
         self.line = line_num
         self.terms = line_split
@@ -183,6 +198,7 @@ class Mode(str, Enum):
 class StatementTerm:
     """Структура для описания команды с аргументом из кода программы."""
 
+    index: int | None
     label: str | None
     opcode: Opcode | None
     arg: int | None | str
@@ -190,6 +206,8 @@ class StatementTerm:
     # Source code reference
     line: int | None
 
+    __slots__ = ("index", "label", "opcode", "arg", "mode", "line")
+
     def __init__(
         self,
         index: int | None = None,
@@ -207,7 +225,7 @@ class StatementTerm:
         self.line = line
 
     def __str__(self) -> str:
-        return {key: value for key, value in self.__dict__.items() if value is not None}.__str__()
+        return slot_fields_str(self)
 
     def __repr__(self) -> str:
         return self.__str__()
@@ -263,6 +281,8 @@ class DataTerm:
     size: int | None
     line: int | None
 
+    __slots__ = ("index", "label", "value", "size", "line")
+
     def __init__(
         self,
         index: int | None = None,
@@ -278,7 +298,7 @@ class DataTerm:
         self.line = line
 
     def __str__(self) -> str:
-        return {key: value for key, value in self.__dict__.items() if value is not None}.__str__()
+        return slot_fields_str(self)
 
     def __repr__(self) -> str:
         return self.__str__()
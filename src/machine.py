@@ -1,7 +1,14 @@
 from __future__ import annotations
 
+import functools
 import logging
+import operator
+import struct
 import sys
+from array import array
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from typing import ClassVar, Final, NoReturn, TypeVar
 
 from isa import Code, MachineWordData, MachineWordInstruction, Mode, Opcode, read_code
 
@@ -15,15 +22,15 @@ class DataBus:
 
     transmitting_value: int
 
-    def __init__(self, connected_devices: dict[int, IO.IODeviceCommon] = dict()) -> None:
-        self._connected_devices = connected_devices
+    def __init__(self, connected_devices: dict[int, IO.IODeviceCommon] | None = None) -> None:
+        self._connected_devices = connected_devices if connected_devices is not None else {}
         self.transmitting_value = 0
         for device in self._connected_devices.values():
             if device._data_bus is None:
                 device._data_bus = self
 
     def connect_device(self, new_device: IO.IODeviceCommon) -> None:
-        new_device_index: int = max(list(self._connected_devices.keys())) + 1 if self._connected_devices else 1
+        new_device_index: int = max(self._connected_devices, default=0) + 1
         self._connected_devices[new_device_index] = new_device
 
 
@@ -33,25 +40,52 @@ class InterruptionLine:
     _machine: Machine
     _connected_devices: dict[int, IO.IODeviceCommon]
 
-    def __init__(self, machine: Machine, connected_devices: dict[int, IO.IODeviceCommon] = dict()) -> None:
+    def __init__(self, machine: Machine, connected_devices: dict[int, IO.IODeviceCommon] | None = None) -> None:
         self._machine = machine
-        self._connected_devices = connected_devices
+        self._connected_devices = connected_devices if connected_devices is not None else {}
         for device in self._connected_devices.values():
             if device._int_line is None:
                 device._int_line = self
 
     def connect_device(self, new_device: IO.IODeviceCommon) -> None:
-        new_device_index: int = max(list(self._connected_devices.keys())) + 1 if self._connected_devices else 1
+        new_device_index: int = max(self._connected_devices, default=0) + 1
         self._connected_devices[new_device_index] = new_device
 
-    def signal_interruption_request(self) -> None:
-        self._machine._control_unit.signal_interruption()
+    def signal_interruption_request(self, requesting_device: IO.IODeviceCommon) -> None:
+        """Передача запроса прерывания от устройства в машину с указанием номера устройства."""
+        for device_index, device in self._connected_devices.items():
+            if device is requesting_device:
+                self._machine._control_unit.signal_interruption(device_index)
 
 
 # Начальное состояние регистра - счётчика команд
-MACHINE_START_ADDR: int = 11
+MACHINE_START_ADDR: Final[int] = 11
 
-INTERRRUPTION_VECTOR_LENGTH: int = 8
+INTERRRUPTION_VECTOR_LENGTH: Final[int] = 8
+
+# Кол-во портов ввода/вывода: по 2 порта (int и data) на каждое устройство
+_IO_PORT_LIMIT: Final[int] = (INTERRRUPTION_VECTOR_LENGTH - 1) * 2
+
+# Формат записи бинарного расписания ввода: такт подачи символа (i64, как массив тактов "q") и код символа (u8)
+SCHEDULE_RECORD_FORMAT: Final[str] = "<qB"
+
+SCHEDULE_RECORD_SIZE: Final[int] = struct.calcsize(SCHEDULE_RECORD_FORMAT)
+
+# Смещение кода символа в записи расписания: сразу после такта
+_SCHEDULE_SYMBOL_OFFSET: Final[int] = struct.calcsize("<q")
+
+# Машинное слово - 32 бита, знаковое: результаты АЛУ приводятся к нему переполнением
+WORD_SIGN_BIT: Final[int] = 1 << 31
+
+WORD_MASK: Final[int] = (1 << 32) - 1
+
+# Кол-во символов вывода, накапливаемых перед записью в stdout
+OUTPUT_CHUNK_SIZE: Final[int] = 64
+
+# Символы для однобайтовых кодов, выводимых устройством вывода
+_CHR: Final[tuple[str, ...]] = tuple(chr(code) for code in range(256))
+
+T = TypeVar("T")
 
 
 def get_machine_start_addr() -> int:
@@ -62,14 +96,10 @@ def get_interruption_vector_length() -> int:
     return INTERRRUPTION_VECTOR_LENGTH
 
 
-def raise_error(err_msg: str = "") -> None:
+def raise_error(err_msg: str = "") -> NoReturn:
     raise ValueError("Internal error X_X : " + err_msg)
 
 
-def bool2int(val: bool) -> int:
-    return 1 if val else 0
-
-
 class IO:
     class IOController:
         """Контроллер ввода/вывода для машины.
@@ -79,6 +109,14 @@ class IO:
 
         _connected_devices: dict[int, IO.IODeviceCommon]
 
+        _PORT_SIGNALS: ClassVar[tuple[str | None, ...]] = (
+            None,
+            "signal_read_int",
+            "signal_read_data",
+            "signal_write_data",
+        )
+        """ Управляющие сигналы устройства по индексу (регистр порта << 1) | режим, None - сигнал не подаётся."""
+
         def __init__(self, connected_devices: dict[int, IO.IODeviceCommon]) -> None:
             self._connected_devices = connected_devices
 
@@ -106,24 +144,17 @@ class IO:
             - 0 - input (device/read)
             - 1 - output (device/write)
             """
-            assert port_addr < (get_interruption_vector_length() - 1) * 2, "IO port is out of bounds"
+            assert port_addr < _IO_PORT_LIMIT, "IO port is out of bounds"
             # В устройствах по 2 регистра, поэтому логика может поменяться при их увеличении
             # однако при увеличении числа устрйоств будет работоспособной
-            device_index = (port_addr // 2) + 1
-            assert (
-                self._connected_devices.get(device_index) is not None
-            ), "IO addressed not connected device {}, port {}".format(device_index, port_addr)  # debug
-            if self._connected_devices.get(device_index) is None:
-                return
-            if port_addr % 2 == 0:
-                if mode == 0:
-                    return
-                self._connected_devices[device_index].signal_read_int()
-            else:
-                if mode == 0:
-                    self._connected_devices[device_index].signal_read_data()
-                else:
-                    self._connected_devices[device_index].signal_write_data()
+            device_index: int = (port_addr >> 1) + 1
+            device: IO.IODeviceCommon | None = self._connected_devices.get(device_index)
+            assert device is not None, "IO addressed not connected device {}, port {}".format(
+                device_index, port_addr
+            )  # debug
+            signal: str | None = IO.IOController._PORT_SIGNALS[((port_addr & 1) << 1) | (mode != 0)]
+            if signal is not None:
+                getattr(device, signal)()
 
     class IODeviceCommon:
         """Устройство ввода/вывода
@@ -143,8 +174,8 @@ class IO:
         _data_register: int
         """ 8-битный регистр для хранения передаваемых/получаемых данных."""
 
-        _int_register: bool
-        """ Регистр запроса прерывания.
+        _int_register: int
+        """ Регистр запроса прерывания (0/1).
 
         Сигнализирует машине о необходимости провести прерывание для считывания данных.
         """
@@ -152,61 +183,116 @@ class IO:
         _new_data: bool
         """ Флаг обновления данных в устройстве."""
 
+        _on_new_data: Callable[[int], None] | None
+        """ Обработчик обновления данных в устройстве, получает значение регистра данных."""
+
         def __init__(self, data_bus: DataBus | None = None, int_line: InterruptionLine | None = None) -> None:
             self._data_bus = data_bus
             self._int_line = int_line
             self._data_register = 0
-            self._int_register = False
+            self._int_register = 0
             self._new_data = False
+            self._on_new_data = None
+
+        def _signal_new_data(self) -> None:
+            """Установка флага обновления данных и оповещение обработчика при наличии."""
+            self._new_data = True
+            if self._on_new_data is not None:
+                self._on_new_data(self._data_register)
 
         def __repr__(self) -> str:
-            return "DATA: {:^3} | INT: {} | NEW: {}".format(self._data_register, self._int_register, self._new_data)
+            return "DATA: {:^3} | INT: {} | NEW: {}".format(
+                self._data_register, bool(self._int_register), self._new_data
+            )
 
         def signal_write_data(self) -> None:
             """Запись данных из шины данных в регистр данных устройства"""
             assert self._data_bus is not None
-            self._int_register = False
-            self._new_data = True
+            self._int_register = 0
             self._data_register = self._data_bus.transmitting_value
+            self._signal_new_data()
 
         def signal_read_data(self) -> None:
             """Запись данных в шину данных с регистра данных"""
             assert self._data_bus is not None
-            self._new_data = True
+            self._signal_new_data()
             self._data_bus.transmitting_value = self._data_register
 
         def signal_read_int(self) -> None:
             """Запись значения регистра прерывания в регистр данных и передача на шину данных"""
             assert self._data_bus is not None
-            self._data_register = ord(str(self._int_register))
-            self._data_bus.transmitting_value = self._data_register
+            self._data_register = self._data_bus.transmitting_value = self._int_register
 
         def signal_int_request(self) -> None:
             """Отправка запроса на прерывание в машину"""
             assert self._int_line is not None
-            self._int_register = True
-            self._new_data = True
-            self._int_line.signal_interruption_request()
+            self._int_register = 1
+            self._signal_new_data()
+            self._int_line.signal_interruption_request(self)
 
     class IODeviceConsole(IODeviceCommon):
         """Устройство ввода/вывода с использованием пользовательского ввода в консоль"""
 
-        _input_buffer: list[str] | None = None
+        _input_buffer: str | None = None
+
+        _input_pos: int = 0
+        """ Позиция следующего символа в буфере ввода."""
+
+        _before_input: Callable[[], None] | None = None
+        """ Обработчик, вызываемый перед запросом строки у пользователя (вывод накопленных машиной символов)."""
 
         def signal_read_data(self) -> None:
             assert self._data_bus is not None
             if self._input_buffer is None:
-                print("")
-                self._input_buffer = [*input()]
-                self._input_buffer.append("\n")
-            self._data_register = ord(self._input_buffer[0])
+                if self._before_input is not None:
+                    self._before_input()
+                sys.stdout.write("\n")
+                self._input_buffer = input() + "\n"
+                self._input_pos = 0
+            self._data_register = ord(self._input_buffer[self._input_pos])
             self._data_bus.transmitting_value = self._data_register
-            if len(self._input_buffer) > 1:
-                self._input_buffer = self._input_buffer[1:]
-            elif len(self._input_buffer) == 1:
-                self._input_buffer.append(chr(10))  # EOL symbol
-            else:
-                self._input_buffer = None
+            # После конца строки устройство продолжает выдавать символ EOL
+            if self._input_pos < len(self._input_buffer) - 1:
+                self._input_pos += 1
+
+
+# Таблицы режимов АЛУ: индекс - код режима, значение - преобразование (левый, правый) входов
+_ALU_NEGATIVE: tuple[Callable[[int, int], tuple[int, int]], ...] = (
+    lambda left, right: (-left, right),
+    lambda left, right: (left, -right),
+    lambda left, right: (-left, -right),
+    lambda left, right: (left, right),
+)
+
+_ALU_INC: tuple[Callable[[int, int], tuple[int, int]], ...] = (
+    lambda left, right: (left + 1, right),
+    lambda left, right: (left, right + 1),
+    lambda left, right: (left + 1, right + 1),
+    lambda left, right: (left, right),
+)
+
+_ALU_DEC: tuple[Callable[[int, int], tuple[int, int]], ...] = (
+    lambda left, right: (left - 1, right),
+    lambda left, right: (left, right - 1),
+    lambda left, right: (left - 1, right - 1),
+    lambda left, right: (left, right),
+)
+
+# Защёлкивание входов АЛУ: (левый - буферный регистр, правый - аккумулятор)
+_ALU_LATCH: tuple[tuple[bool, bool], ...] = ((True, False), (False, True), (True, True), (False, False))
+
+# Таблица операций АЛУ: индекс - код операции, аргументы - (правый, левый) входы
+_ALU_OPS: tuple[Callable[[int, int], int], ...] = (
+    operator.add,
+    operator.sub,
+    operator.mul,
+    operator.floordiv,
+    operator.mod,
+    operator.and_,
+    operator.or_,
+    lambda right, left: right << 1,
+    lambda right, left: right >> 1,
+)
 
 
 class DataPath:
@@ -228,11 +314,30 @@ class DataPath:
     _memory: list[MachineWordInstruction | MachineWordData]
     """Общая память, к которой DataPath обращается для чтения/записи данных"""
 
+    _memory_values: array[int]
+    """Значения ячеек общей памяти в виде 32-битных слов, параллельные `_memory` (0 - ячейка с инструкцией)"""
+
+    _data_cells: bytearray
+    """Признаки ячеек данных общей памяти, параллельные `_memory` (0 - ячейка с инструкцией)"""
+
     _alu: ALU
     """Арифметико - логическое устройство"""
 
     _data_bus: DataBus
 
+    __slots__ = (
+        "_accumulator_register",
+        "_address_register",
+        "_buffer_register",
+        "_neg_flag",
+        "_zero_flag",
+        "_memory",
+        "_memory_values",
+        "_data_cells",
+        "_alu",
+        "_data_bus",
+    )
+
     def __init__(self, common_memory: list[MachineWordInstruction | MachineWordData], data_bus: DataBus) -> None:
         self._accumulator_register = 0
         self._address_register = 0
@@ -240,6 +345,7 @@ class DataPath:
         self._neg_flag = False
         self._zero_flag = True
         self._memory = common_memory
+        self.load_memory_values()
         self._alu = DataPath.ALU()
         self._data_bus = data_bus
 
@@ -257,6 +363,8 @@ class DataPath:
         _res_zero: bool
         _res_neg: bool
 
+        __slots__ = ("_output_buffer_register", "_left_register", "_right_register", "_res_zero", "_res_neg")
+
         def __init__(self) -> None:
             self._output_buffer_register = 0
             self.reset_registers()
@@ -277,18 +385,8 @@ class DataPath:
             2 - оба
             3 - ни один
             """
-            match mode:
-                case 0:
-                    self._left_register = ~self._left_register + 1
-                case 1:
-                    self._right_register = ~self._right_register + 1
-                case 2:
-                    self._left_register = ~self._left_register + 1
-                    self._right_register = ~self._right_register + 1
-                case 3:
-                    pass
-                case _:
-                    raise_error("Incorrect data_path/alu/negative mode")
+            transform = _alu_mode(_ALU_NEGATIVE, mode, "Incorrect data_path/alu/negative mode")
+            self._left_register, self._right_register = transform(self._left_register, self._right_register)
 
         def inc(self, mode: int) -> None:
             """Инкремент данных
@@ -299,18 +397,8 @@ class DataPath:
             2 - оба
             3 - ни один
             """
-            match mode:
-                case 0:
-                    self._left_register += 1
-                case 1:
-                    self._right_register += 1
-                case 2:
-                    self._left_register += 1
-                    self._right_register += 1
-                case 3:
-                    pass
-                case _:
-                    raise_error("Incorrect data_path/alu/zero mode")
+            transform = _alu_mode(_ALU_INC, mode, "Incorrect data_path/alu/zero mode")
+            self._left_register, self._right_register = transform(self._left_register, self._right_register)
 
         def dec(self, mode: int) -> None:
             """Декремент данных
@@ -321,18 +409,8 @@ class DataPath:
             2 - оба
             3 - ни один
             """
-            match mode:
-                case 0:
-                    self._left_register -= 1
-                case 1:
-                    self._right_register -= 1
-                case 2:
-                    self._left_register -= 1
-                    self._right_register -= 1
-                case 3:
-                    pass
-                case _:
-                    raise_error("Incorrect data_path/alu/dec mode")
+            transform = _alu_mode(_ALU_DEC, mode, "Incorrect data_path/alu/dec mode")
+            self._left_register, self._right_register = transform(self._left_register, self._right_register)
 
         def operation(self, mode: int) -> None:
             """Операция над данными
@@ -347,28 +425,12 @@ class DataPath:
             6 - логическое "ИЛИ"
             7 - логический побитовый сдвиг влево
             8 - арифметический побитовый сдвиг вправо
+
+            Результат приводится к 32-битному знаковому машинному слову.
             """
-            match mode:
-                case 0:
-                    self._output_buffer_register = self._right_register + self._left_register
-                case 1:
-                    self._output_buffer_register = self._right_register - self._left_register
-                case 2:
-                    self._output_buffer_register = self._right_register * self._left_register
-                case 3:
-                    self._output_buffer_register = self._right_register // self._left_register
-                case 4:
-                    self._output_buffer_register = self._right_register % self._left_register
-                case 5:
-                    self._output_buffer_register = self._right_register & self._left_register
-                case 6:
-                    self._output_buffer_register = self._right_register | self._left_register
-                case 7:
-                    self._output_buffer_register = self._right_register << 1
-                case 8:
-                    self._output_buffer_register = self._right_register >> 1
-                case _:
-                    raise_error("Incorrect data_path/alu/operation mode")
+            operation = _alu_mode(_ALU_OPS, mode, "Incorrect data_path/alu/operation mode")
+            result: int = operation(self._right_register, self._left_register)
+            self._output_buffer_register = ((result + WORD_SIGN_BIT) & WORD_MASK) - WORD_SIGN_BIT
             self._res_neg = self._output_buffer_register < 0
             self._res_zero = self._output_buffer_register == 0
 
@@ -376,17 +438,54 @@ class DataPath:
         self._zero_flag = self._alu._res_zero
         self._neg_flag = self._alu._res_neg
 
+    def load_memory_values(self, count: int | None = None) -> None:
+        """Выделение значений ячеек данных общей памяти в отдельный массив машинных слов.
+
+        Необходимо вызывать после каждой загрузки программы в общую память. Если задано `count`,
+        обновляются только первые `count` ячеек (область загруженной программы), остальные остаются прежними.
+        """
+        words: list[MachineWordInstruction | MachineWordData] = self._memory if count is None else self._memory[:count]
+        data_cells: bytearray = bytearray(isinstance(word, MachineWordData) for word in words)
+        try:
+            values: array[int] = array("i", (word.value if isinstance(word, MachineWordData) else 0 for word in words))
+        except OverflowError:
+            raise AssertionError("Data word value exceeds machine word size") from None
+        if count is None:
+            self._data_cells, self._memory_values = data_cells, values
+        else:
+            self._data_cells[:count], self._memory_values[:count] = data_cells, values
+
     def _read_memory(self) -> int:
-        """Чтение из памяти по адресу из адресного регистра значения в аккумулятор."""
-        assert (
-            len(self._memory) >= self._address_register
-        ), "Access memory out of limited bounds, requested address: {}.".format(self._address_register)
-        assert isinstance(self._memory[self._address_register].value, int), "Mem bounds or get value from MemWordInstr"
-        return self._memory[self._address_register].value
+        """Чтение из памяти по адресу из адресного регистра значения в аккумулятор.
+
+        Выход за границы памяти определяется проверкой индекса самим массивом.
+        """
+        try:
+            is_data: int = self._data_cells[self._address_register]
+        except IndexError:
+            raise AssertionError(
+                "Access memory out of limited bounds, requested address: {}.".format(self._address_register)
+            ) from None
+        assert is_data, "Mem bounds or get value from MemWordInstr"
+        return self._memory_values[self._address_register]
+
+    def store_memory_values(self) -> None:
+        """Перенос значений ячеек данных обратно в ячейки общей памяти.
+
+        Необходимо вызывать по окончании работы с памятью, чтобы ячейки данных отражали записанные значения.
+        """
+        for word, is_data, value in zip(self._memory, self._data_cells, self._memory_values, strict=True):
+            if is_data:
+                assert isinstance(word, MachineWordData)
+                word.value = value
 
     def _write_memory(self) -> None:
-        """Запись в память по значению адресного регистра значения аккумулятора."""
-        self._memory[self._address_register].value = self._accumulator_register
+        """Запись в память по значению адресного регистра значения аккумулятора.
+
+        Значение записывается только в массив значений ячеек данных (см. `store_memory_values`).
+        """
+        assert self._data_cells[self._address_register], "Write value to MemWordInstr"
+        self._memory_values[self._address_register] = self._accumulator_register
 
     def zero(self) -> bool:
         """Возврат значения"""
@@ -396,6 +495,97 @@ class DataPath:
         return self._neg_flag
 
 
+def _alu_mode(table: tuple[T, ...], mode: int, err_msg: str) -> T:
+    """Выбор элемента таблицы режимов АЛУ с проверкой кода режима."""
+    if not 0 <= mode < len(table):
+        raise_error(err_msg)
+    return table[mode]
+
+
+AluTransform = Callable[[int, int], tuple[int, int]]
+""" Преобразование входов АЛУ (левый, правый)."""
+
+
+def _decode_alu_select(
+    select: tuple[int, ...],
+) -> tuple[bool, bool, tuple[AluTransform, ...], Callable[[int, int], int]]:
+    """Разбор набора селекторов АЛУ: защёлкиваемые входы, преобразования входов и операция.
+
+    Набор селекторов соответствует `ControlUnit.signal_latch_arithmetical_logical_unit`.
+    """
+    latch, *modes, op = select
+    load_left, load_right = _alu_mode(_ALU_LATCH, latch, "Incorrect control_unit/signal_alu select")
+    transforms: tuple[AluTransform, ...] = tuple(
+        _alu_mode(table, mode, "Incorrect data_path/alu/{} mode".format(name))
+        for table, mode, name in zip(
+            (_ALU_NEGATIVE, _ALU_INC, _ALU_DEC), modes, ("negative", "zero", "dec"), strict=True
+        )
+        if mode != 3
+    )
+    operation: Callable[[int, int], int] = _alu_mode(_ALU_OPS, op, "Incorrect data_path/alu/operation mode")
+    return load_left, load_right, transforms, operation
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_alu(select: tuple[int, ...]) -> Callable[[DataPath], None]:
+    """Сборка программы АЛУ для постоянного набора селекторов.
+
+    Разбор селекторов выполняется один раз: возвращаемая функция выполняет только нужные
+    преобразования входов и операцию, после чего обновляет флаги тракта данных.
+    """
+    load_left, load_right, transforms, operation = _decode_alu_select(select)
+
+    def alu_programm(data_path: DataPath) -> None:
+        # Внутренние регистры АЛУ сбрасываются после каждой операции, поэтому незащёлкнутый вход равен 0
+        left: int = data_path._buffer_register if load_left else 0
+        right: int = data_path._accumulator_register if load_right else 0
+        for transform in transforms:
+            left, right = transform(left, right)
+        result: int = ((operation(right, left) + WORD_SIGN_BIT) & WORD_MASK) - WORD_SIGN_BIT
+        alu: DataPath.ALU = data_path._alu
+        alu._output_buffer_register = result
+        alu._res_neg = data_path._neg_flag = result < 0
+        alu._res_zero = data_path._zero_flag = result == 0
+
+    return alu_programm
+
+
+# Управляющие слова АЛУ, используемые циклами исполнения команд
+_ALU_SELECT_LD: tuple[int, ...] = (0, 3, 3, 3, 6)
+_ALU_SELECT_ADD: tuple[int, ...] = (2, 3, 3, 3, 0)
+_ALU_SELECT_SUB: tuple[int, ...] = (2, 3, 3, 3, 1)
+_ALU_SELECT_INC: tuple[int, ...] = (1, 3, 1, 3, 6)
+_ALU_SELECT_DEC: tuple[int, ...] = (1, 3, 3, 1, 6)
+_ALU_SELECT_MUL: tuple[int, ...] = (2, 3, 3, 3, 2)
+_ALU_SELECT_DIV: tuple[int, ...] = (2, 3, 3, 3, 3)
+_ALU_SELECT_MOD: tuple[int, ...] = (2, 3, 3, 3, 4)
+_ALU_SELECT_AND: tuple[int, ...] = (2, 3, 3, 3, 5)
+_ALU_SELECT_OR: tuple[int, ...] = (2, 3, 3, 3, 6)
+_ALU_SELECT_LSL: tuple[int, ...] = (2, 3, 3, 3, 7)
+_ALU_SELECT_ASR: tuple[int, ...] = (2, 3, 3, 3, 8)
+
+
+def _alu_execution_handler(select: tuple[int, ...]) -> Callable[[ControlUnit], None]:
+    """Цикл исполнения команды АЛУ с записью результата в аккумулятор.
+
+    Операция выполняется программой АЛУ из `_compile_alu`, после чего результат записывается
+    в аккумулятор и выполняется такт.
+    """
+    alu_programm: Callable[[DataPath], None] = _compile_alu(select)
+
+    def execute(control_unit: ControlUnit) -> None:
+        data_path: DataPath = control_unit._data_path
+        alu_programm(data_path)
+        data_path._accumulator_register = data_path._alu._output_buffer_register
+        control_unit.perform_tick()
+
+    return execute
+
+
+# Декодированная инструкция: (инструкция, цикл выборки аргумента, цикл исполнения)
+DecodedInstruction = tuple[MachineWordInstruction, Callable[["ControlUnit"], None], Callable[["ControlUnit"], None]]
+
+
 class ControlUnit:
     """Логический модуль машины, отвечающий за управление потоком выполнения машины."""
 
@@ -405,14 +595,15 @@ class ControlUnit:
     _programm_counter_register: int
     """ IP регистр - используется для доступа к памяти при передаче адреса, значение по которому необходимо "достать"."""
 
-    _instruction_register: MachineWordInstruction | None
-    """ Регистр инструкций. Хранит в себе текущее выражение на исполенние (инструкцию с аргументом) после цикла выборки команд."""
+    _instruction_register: MachineWordInstruction
+    """ Регистр инструкций. Хранит в себе текущее выражение на исполенние (инструкцию с аргументом) после цикла выборки команд.
+    До первой выборки содержит пустую инструкцию nop, поэтому не проверяется на None в цикле исполнения."""
 
     _interruption_enabled: bool
     """ Регистр - указывающий возможно ли выполнить прерывание в текущем цикле исполнения инструкции."""
 
-    _interruption_request: bool
-    """ Регистр - указывающий есть ли запрос на прерывание от подключённых устройств."""
+    _interruption_requests: int
+    """ Регистр запросов на прерывание от подключённых устройств: бит k - запрос от устройства k."""
 
     _interruption_state: bool
     """ Флаг нахождения машины в состоянии прерывания."""
@@ -429,6 +620,18 @@ class ControlUnit:
     _data_path: DataPath
     """ Соединение с DataPath для управления манипулированием данными."""
 
+    _decoded_programm: list[DecodedInstruction | None]
+    """ Декодированные при загрузке программы инструкции по адресам памяти, None - ячейка данных."""
+
+    _operand_fetch: Callable[[ControlUnit], None]
+    """ Цикл выборки аргумента текущей инструкции."""
+
+    _execution_handler: Callable[[ControlUnit], None]
+    """ Обработчик цикла исполнения текущей инструкции."""
+
+    trace_ticks: bool
+    """ Журналирование состояния процессора на каждом такте."""
+
     def __init__(
         self,
         common_memory: list[MachineWordInstruction | MachineWordData],
@@ -437,42 +640,42 @@ class ControlUnit:
     ) -> None:
         self._tick = 0
         self._interruption_enabled = False
-        self._interruption_request = False
+        self._interruption_requests = 0
         self._interruption_state = False
         self._programm_counter_register = MACHINE_START_ADDR
-        self._instruction_register = None
+        self._instruction_register = MachineWordInstruction(index=0, opcode=Opcode.NOP, line=0)
         self._instruction_decoder = ControlUnit.InstructionDecoder()
         self._memory = common_memory
         self._data_path = data_path
         self._io_controller = io_controller
+        self._operand_fetch = ControlUnit._fetch_none
+        self._execution_handler = ControlUnit.perform_tick
+        self.trace_ticks = True
+        self.specialize_programm()
 
     def __repr__(self) -> str:
         """Вернуть строковое представление состояния процессора."""
-        assert self._instruction_register is not None
         device_state: str = ""
-        if self._instruction_register.opcode in [Opcode.IN, Opcode.OUT]:
-            io_port: int = self._instruction_register.arg
+        io_port: int | None = self._instruction_register.arg
+        if io_port is not None and self._instruction_register.opcode in (Opcode.IN, Opcode.OUT):
             device_index: int = io_port // 2 + 1
             device_state = (
                 "\n\t Dev: {} | Port: {} | ".format(device_index, io_port)
                 + self._io_controller._connected_devices.get(device_index).__repr__()
             )
+        data_path: DataPath = self._data_path
+        address: int = data_path._address_register
+        memory_value: int | None = (
+            data_path._memory_values[address]
+            if 0 <= address < len(data_path._data_cells) and data_path._data_cells[address]
+            else None
+        )
         return (
-            "TICK: {:3} | PC: {:3} | IR: '{:^11}' | IRQ: {} | IE: {} | IS: {} | AC: {:^10} | BR: {:3} | AR: {:3} | MEM_AR: {} | N: {} | Z: {}".format(
-                self.get_tick(),
-                self._programm_counter_register,
-                self._instruction_register.opcode,
-                bool2int(self._interruption_request),
-                bool2int(self._interruption_enabled),
-                bool2int(self._interruption_state),
-                self._data_path._accumulator_register,
-                self._data_path._buffer_register,
-                self._data_path._address_register,
-                self._data_path._read_memory(),
-                bool2int(self._data_path.negative()),
-                bool2int(self._data_path.zero()),
-            )
-            + device_state
+            f"TICK: {self._tick:3} | PC: {self._programm_counter_register:3} "
+            f"| IR: '{self._instruction_register.opcode:^11}' | IRQ: {self._interruption_requests != 0:d} "
+            f"| IE: {self._interruption_enabled:d} | IS: {self._interruption_state:d} "
+            f"| AC: {data_path._accumulator_register:^10} | BR: {data_path._buffer_register:3} | AR: {address:3} "
+            f"| MEM_AR: {memory_value} | N: {data_path._neg_flag:d} | Z: {data_path._zero_flag:d}" + device_state
         )
 
     class InstructionDecoder:
@@ -492,22 +695,23 @@ class ControlUnit:
         def signal_latch_opcode(self, opcode: Opcode) -> None:
             self._opcode = opcode
 
-        def signal_latch_mode(self, mode: Mode) -> None:
+        def signal_latch_mode(self, mode: Mode | None) -> None:
             self._mode = mode
 
     def perform_tick(self) -> None:
         """Увеличение счётчика процессорных тактов."""
         self._tick += 1
-        logging.info(self.__repr__())
+        if self.trace_ticks:
+            logging.info(self.__repr__())
 
     def get_tick(self) -> int:
         return self._tick
 
-    def signal_interruption(self) -> None:
+    def signal_interruption(self, device_index: int) -> None:
         """Установка запроса прерывания в машине от переферийного устройства
 
         Вызываетс через линию прерываний."""
-        self._interruption_request = True
+        self._interruption_requests |= 1 << device_index
 
     def signal_input_output(self, select_port: int, select_mode: int) -> None:
         """Сигнал ввода данных из указанного порта вывода на аккумулятор.
@@ -528,7 +732,7 @@ class ControlUnit:
         0 - ввод,
         1 - вывод
         """
-        assert select_port < (get_interruption_vector_length() - 1) * 2, "Incorrect control_unit/signal_spi select"
+        assert select_port < _IO_PORT_LIMIT, "Incorrect control_unit/signal_spi select"
         self._io_controller.send_signal(port_addr=select_port, mode=select_mode)
 
     def signal_latch_address_register(self, select: int) -> None:
@@ -541,16 +745,18 @@ class ControlUnit:
         2 - int_acc (fix address in memory)
         3 - int_pc (fix address in memory)
         """
+        data_path: DataPath = self._data_path
         match select:
             case 0:
-                assert self._instruction_register is not None
-                self._data_path._address_register = self._instruction_register.arg
+                arg: int | None = self._instruction_register.arg
+                assert arg is not None
+                data_path._address_register = arg
             case 1:
-                self._data_path._address_register = self._data_path._buffer_register
+                data_path._address_register = data_path._buffer_register
             case 2:
-                self._data_path._address_register = INTERRRUPTION_VECTOR_LENGTH
+                data_path._address_register = INTERRRUPTION_VECTOR_LENGTH
             case 3:
-                self._data_path._address_register = INTERRRUPTION_VECTOR_LENGTH + 1
+                data_path._address_register = INTERRRUPTION_VECTOR_LENGTH + 1
             case _:
                 raise_error("Incorrect control_unit/signal_address select")
 
@@ -564,15 +770,16 @@ class ControlUnit:
         2 - io (data_bus)
         3 - pc (control_unit/programm_counter_register)
         """
+        data_path: DataPath = self._data_path
         match select:
             case 0:
-                self._data_path._accumulator_register = self._data_path._read_memory()
+                data_path._accumulator_register = data_path._read_memory()
             case 1:
-                self._data_path._accumulator_register = self._data_path._alu._output_buffer_register
+                data_path._accumulator_register = data_path._alu._output_buffer_register
             case 2:
-                self._data_path._accumulator_register = 0xFF & self._data_path._data_bus.transmitting_value
+                data_path._accumulator_register = 0xFF & data_path._data_bus.transmitting_value
             case 3:
-                self._data_path._accumulator_register = self._programm_counter_register
+                data_path._accumulator_register = self._programm_counter_register
             case _:
                 raise_error("Incorrect control_unit/signal_acc select")
 
@@ -585,20 +792,22 @@ class ControlUnit:
         1 - mem (data_path/memory)
         2 - io_int (requesting device interruption vector)
         """
+        data_path: DataPath = self._data_path
         match select:
             case 0:
-                assert self._instruction_register is not None
-                self._data_path._buffer_register = self._instruction_register.arg
+                arg: int | None = self._instruction_register.arg
+                assert arg is not None
+                data_path._buffer_register = arg
             case 1:
-                self._data_path._buffer_register = self._data_path._read_memory()
+                data_path._buffer_register = data_path._read_memory()
             case 2:
-                for dev_index, device in self._io_controller._connected_devices.items():
-                    if device._int_register:
-                        self._data_path._buffer_register = dev_index
+                requests: int = self._interruption_requests
+                if requests:
+                    data_path._buffer_register = (requests & -requests).bit_length() - 1
             case _:
                 raise_error("Incorrect control_unit/signal_buff select")
 
-    def signal_latch_arithmetical_logical_unit(self, select: list[int] = [1, 3, 3, 3, 6]) -> None:
+    def signal_latch_arithmetical_logical_unit(self, select: Sequence[int]) -> None:
         """Сигнал передачи данных в арифметико-логическое устройство.
 
         Происходит посредством установки селекторов. Представлена списком опций.
@@ -635,24 +844,7 @@ class ControlUnit:
             7 - логический побитовый сдвиг влево
             8 - арифметический побитовый сдвиг вправо
         """
-        match select[0]:
-            case 0:
-                self._data_path._alu._left_register = self._data_path._buffer_register
-            case 1:
-                self._data_path._alu._right_register = self._data_path._accumulator_register
-            case 2:
-                self._data_path._alu._left_register = self._data_path._buffer_register
-                self._data_path._alu._right_register = self._data_path._accumulator_register
-            case 3:
-                pass
-            case _:
-                raise_error("Incorrect control_unit/signal_alu select")
-        self._data_path._alu.negative(select[1])
-        self._data_path._alu.inc(select[2])
-        self._data_path._alu.dec(select[3])
-        self._data_path._alu.operation(select[4])
-        self._data_path.update_flags()
-        self._data_path._alu.reset_registers()
+        _compile_alu(tuple(select))(self._data_path)
 
     def signal_latch_programm_counter_register(self, select: int) -> None:
         """Сигнал записи данных в регистр - счётчик команд через мультиплексор.
@@ -677,199 +869,225 @@ class ControlUnit:
         Сохранение аккумулятора и счётчика команд в определенные для этого ячейки памяти,
         установка флага обработки прерывания и сохранение номера прерывания в аккумулятор.
         """
+        data_path: DataPath = self._data_path
         # Запись в память значения аккумулятора
-        self.signal_latch_address_register(select=2)
+        data_path._address_register = INTERRRUPTION_VECTOR_LENGTH
         self.perform_tick()
-        self._data_path._write_memory()
+        data_path._write_memory()
         self.perform_tick()
         # Запись в память значения регистра - счётчика команд
-        self.signal_latch_accumulator_register(select=3)
+        data_path._accumulator_register = self._programm_counter_register
         self.perform_tick()
-        self.signal_latch_address_register(select=3)
+        data_path._address_register = INTERRRUPTION_VECTOR_LENGTH + 1
         self.perform_tick()
-        self._data_path._write_memory()
+        data_path._write_memory()
         self.perform_tick()
         # Изменение значения счётчика команд
-        self.signal_latch_address_register(select=1)  # номер обработчика в буффере
+        data_path._address_register = data_path._buffer_register  # номер обработчика в буффере
         self.perform_tick()
-        self.signal_latch_buffer_register(select=1)
+        data_path._buffer_register = data_path._read_memory()
+        self.perform_tick()
+        self._programm_counter_register = data_path._buffer_register
         self.perform_tick()
-        self.signal_latch_programm_counter_register(select=0)
         self.perform_tick()
         self._interruption_state = True
-        self.signal_latch_arithmetical_logical_unit(select=[0, 3, 3, 3, 6])
-        self.signal_latch_accumulator_register(select=1)
+        _compile_alu(_ALU_SELECT_LD)(data_path)
+        data_path._accumulator_register = data_path._alu._output_buffer_register
         self.perform_tick()
 
     def _select_instruction(self) -> None:
         """Цикл выборки инструкции из памяти по адресу счётчика команд.
 
         Имеет место допущение, что доступ к памяти происходит за такт процессора."""
-        self._instruction_register = self._memory[self._programm_counter_register]
+        decoded: DecodedInstruction | None = self._decoded_programm[self._programm_counter_register]
+        if decoded is None:
+            raise_error("Instruction fetch from data memory cell, address: {}".format(self._programm_counter_register))
+        self._instruction_register, self._operand_fetch, self._execution_handler = decoded
         self.perform_tick()
         self.signal_latch_programm_counter_register(select=1)
         self.perform_tick()
 
     def _decode_instruction(self) -> None:
         """Цикл декодирования инструкций."""
-        assert self._instruction_register is not None
-        self._instruction_decoder.signal_latch_opcode(self._instruction_register.opcode)
-        self._instruction_decoder.signal_latch_mode(self._instruction_register.mode)
+        decoder: ControlUnit.InstructionDecoder = self._instruction_decoder
+        decoder._opcode = self._instruction_register.opcode
+        decoder._mode = self._instruction_register.mode
         self.perform_tick()
 
     def _select_argumet(self) -> None:
         """Цикл выборки аргумента."""
-        match self._instruction_decoder._mode:
-            # Непосредственная адресация - запись в буфер аргумента команды
-            case Mode.VALUE:
-                self.signal_latch_buffer_register(select=0)
-                self.perform_tick()
-            # Прямая адресация - запись в буфер значения по адресу из аргумента команды
-            case Mode.DIRECT:
-                self.signal_latch_address_register(select=0)
-                self.perform_tick()
-                self.signal_latch_buffer_register(select=1)
-                self.perform_tick()
-            # Косвенная адресация - запись в буфер значения по адресу, располагающемуся по адресу из аргумента команды
-            case Mode.INDIRECT:
-                self.signal_latch_address_register(select=0)
-                self.perform_tick()
-                self.signal_latch_buffer_register(select=1)
-                self.perform_tick()
-                self.signal_latch_address_register(select=1)
-                self.perform_tick()
-                self.signal_latch_buffer_register(select=1)
-                self.perform_tick()
-            case None:
-                self.perform_tick()
-            case _:
-                raise ValueError("Mode at some instruction in source code is incorrect.")
+        self._operand_fetch(self)
+
+    def _instruction_arg(self) -> int:
+        """Аргумент команды из регистра инструкций."""
+        arg: int | None = self._instruction_register.arg
+        assert arg is not None
+        return arg
+
+    def _fetch_value(self) -> None:
+        """Непосредственная адресация - запись в буфер аргумента команды."""
+        self._data_path._buffer_register = self._instruction_arg()
+        self.perform_tick()
+
+    def _fetch_direct(self) -> None:
+        """Прямая адресация - запись в буфер значения по адресу из аргумента команды."""
+        data_path: DataPath = self._data_path
+        data_path._address_register = self._instruction_arg()
+        self.perform_tick()
+        data_path._buffer_register = data_path._read_memory()
+        self.perform_tick()
+
+    def _fetch_indirect(self) -> None:
+        """Косвенная адресация - запись в буфер значения по адресу, располагающемуся по адресу из аргумента команды."""
+        data_path: DataPath = self._data_path
+        data_path._address_register = self._instruction_arg()
+        self.perform_tick()
+        data_path._buffer_register = data_path._read_memory()
+        self.perform_tick()
+        data_path._address_register = data_path._buffer_register
+        self.perform_tick()
+        data_path._buffer_register = data_path._read_memory()
+        self.perform_tick()
+
+    def _fetch_none(self) -> None:
+        """Команда без аргумента."""
+        self.perform_tick()
+
+    def _fetch_invalid(self) -> None:
+        """Неизвестный режим адресации."""
+        raise ValueError("Mode at some instruction in source code is incorrect.")
+
+    def _execute_st(self) -> None:
+        self.signal_latch_address_register(select=1)
+        self.perform_tick()
+        self._data_path._write_memory()
+        self.perform_tick()
+
+    def _execute_in(self) -> None:
+        self.signal_input_output(select_port=self._data_path._buffer_register, select_mode=0)
+        self.signal_latch_accumulator_register(select=2)
+        if self._interruption_state and self._interruption_requests:
+            # Снимается запрос обслуживаемого устройства - с наименьшим номером
+            self._interruption_requests &= self._interruption_requests - 1
+        self.perform_tick()
+
+    def _execute_out(self) -> None:
+        self._data_path._data_bus.transmitting_value = 0xFF & self._data_path._accumulator_register
+        self.signal_input_output(select_port=self._data_path._buffer_register, select_mode=1)
+        self.perform_tick()
+
+    def _execute_cmp(self) -> None:
+        _compile_alu(_ALU_SELECT_SUB)(self._data_path)
+        self.perform_tick()
+
+    def _execute_jmp(self) -> None:
+        self.signal_latch_programm_counter_register(select=0)
+        self.perform_tick()
+
+    def _take_jump(self) -> None:
+        """Переход по адресу из буферного регистра (условие выполнено)."""
+        self.perform_tick()
+        self._programm_counter_register = self._data_path._buffer_register
+        self.perform_tick()
+
+    # Условные переходы читают флаги тракта данных напрямую: флаги выставляет последняя операция АЛУ
+    # (в том числе CMP, не изменяющая аккумулятор), поэтому проверять значение аккумулятора нельзя.
+    def _execute_jz(self) -> None:
+        if self._data_path._zero_flag:
+            self._take_jump()
+        self.perform_tick()
+
+    def _execute_jnz(self) -> None:
+        if not self._data_path._zero_flag:
+            self._take_jump()
+        self.perform_tick()
+
+    def _execute_jn(self) -> None:
+        if self._data_path._neg_flag:
+            self._take_jump()
+        self.perform_tick()
+
+    def _execute_jp(self) -> None:
+        if not self._data_path._neg_flag:
+            self._take_jump()
+        self.perform_tick()
+
+    def _execute_int(self) -> None:
+        self._prepare_for_interruption()
+
+    def _execute_fi(self) -> None:
+        if self.trace_ticks:
+            # Чтение из памяти значение счётчика команд
+            self.signal_latch_address_register(select=3)
+            self.perform_tick()
+            self.signal_latch_buffer_register(select=1)
+            self.perform_tick()
+            self.signal_latch_programm_counter_register(select=0)
+            self.perform_tick()
+            # Чтение из памяти значения аккумулятора
+            self.signal_latch_address_register(select=2)
+            self.perform_tick()
+            self.signal_latch_accumulator_register(select=0)
+            self.perform_tick()
+        else:
+            # Без журналирования тактов промежуточные состояния не наблюдаемы:
+            # регистры восстанавливаются напрямую, счётчик тактов увеличивается на длину цикла
+            data_path: DataPath = self._data_path
+            data_path._address_register = INTERRRUPTION_VECTOR_LENGTH + 1
+            data_path._buffer_register = self._programm_counter_register = data_path._read_memory()
+            data_path._address_register = INTERRRUPTION_VECTOR_LENGTH
+            data_path._accumulator_register = data_path._read_memory()
+            self._tick += 6
+        # Обнуление флага обработки прерывания
+        self._interruption_state = False
+
+    def _execute_eni(self) -> None:
+        self._interruption_enabled = True
+        self.perform_tick()
+
+    def _execute_dii(self) -> None:
+        self._interruption_enabled = False
+        self.perform_tick()
+
+    def _execute_hlt(self) -> None:
+        raise StopIteration()
+
+    def _select_execution_handler(self, opcode: Opcode) -> Callable[[ControlUnit], None]:
+        """Выбор обработчика цикла исполнения для кода операции."""
+        handler: Callable[[ControlUnit], None] | None = ControlUnit._OPCODE_TABLE.get(opcode)
+        if handler is None:
+            raise_error("Unknown opcode in instruction execute cycle")
+        return handler
+
+    def _decode_programm_word(self, word: MachineWordInstruction | MachineWordData) -> DecodedInstruction | None:
+        """Декодирование ячейки памяти: инструкция, цикл выборки аргумента и цикл исполнения."""
+        if not isinstance(word, MachineWordInstruction):
+            return None
+        return (
+            word,
+            ControlUnit._MODE_TABLE.get(word.mode, ControlUnit._fetch_invalid),
+            self._select_execution_handler(word.opcode),
+        )
+
+    def specialize_programm(self, count: int | None = None) -> None:
+        """Специализация циклов исполнения под загруженную в память программу.
+
+        Программа известна до первого такта, а ячейки с инструкциями не изменяются во время работы
+        (запись в память возможна только в ячейки данных).
+        """
+        if count is None:
+            self._decoded_programm = [self._decode_programm_word(word) for word in self._memory]
+        else:
+            # Декодируются только ячейки загруженной программы, остальная память уже декодирована
+            self._decoded_programm[:count] = [self._decode_programm_word(word) for word in self._memory[:count]]
 
     def _execute_instruction(self) -> None:
-        """Цикл выборки команд."""
-        match self._instruction_decoder._opcode:
-            case Opcode.LD:
-                self.signal_latch_arithmetical_logical_unit(select=[0, 3, 3, 3, 6])
-                self.signal_latch_accumulator_register(select=1)
-                self.perform_tick()
-            case Opcode.ST:
-                self.signal_latch_address_register(select=1)
-                self.perform_tick()
-                self._data_path._write_memory()
-                self.perform_tick()
-            case Opcode.IN:
-                self.signal_input_output(select_port=self._data_path._buffer_register, select_mode=0)
-                self.signal_latch_accumulator_register(select=2)
-                if self._interruption_state and self._interruption_request:
-                    self._interruption_request = False
-                self.perform_tick()
-            case Opcode.OUT:
-                self._data_path._data_bus.transmitting_value = 0xFF & self._data_path._accumulator_register
-                self.signal_input_output(select_port=self._data_path._buffer_register, select_mode=1)
-                self.perform_tick()
-            case Opcode.ADD:
-                self.signal_latch_arithmetical_logical_unit(select=[2, 3, 3, 3, 0])
-                self.signal_latch_accumulator_register(select=1)
-                self.perform_tick()
-            case Opcode.SUB:
-                self.signal_latch_arithmetical_logical_unit(select=[2, 3, 3, 3, 1])
-                self.signal_latch_accumulator_register(select=1)
-                self.perform_tick()
-            case Opcode.CMP:
-                self.signal_latch_arithmetical_logical_unit(select=[2, 3, 3, 3, 1])
-                self.perform_tick()
-            case Opcode.INC:
-                self.signal_latch_arithmetical_logical_unit(select=[1, 3, 1, 3, 6])
-                self.signal_latch_accumulator_register(select=1)
-                self.perform_tick()
-            case Opcode.DEC:
-                self.signal_latch_arithmetical_logical_unit(select=[1, 3, 3, 1, 6])
-                self.signal_latch_accumulator_register(select=1)
-                self.perform_tick()
-            case Opcode.MUL:
-                self.signal_latch_arithmetical_logical_unit(select=[2, 3, 3, 3, 2])
-                self.signal_latch_accumulator_register(select=1)
-                self.perform_tick()
-            case Opcode.DIV:
-                self.signal_latch_arithmetical_logical_unit(select=[2, 3, 3, 3, 3])
-                self.signal_latch_accumulator_register(select=1)
-                self.perform_tick()
-            case Opcode.MOD:
-                self.signal_latch_arithmetical_logical_unit(select=[2, 3, 3, 3, 4])
-                self.signal_latch_accumulator_register(select=1)
-                self.perform_tick()
-            case Opcode.AND:
-                self.signal_latch_arithmetical_logical_unit(select=[2, 3, 3, 3, 5])
-                self.signal_latch_accumulator_register(select=1)
-                self.perform_tick()
-            case Opcode.OR:
-                self.signal_latch_arithmetical_logical_unit(select=[2, 3, 3, 3, 6])
-                self.signal_latch_accumulator_register(select=1)
-                self.perform_tick()
-            case Opcode.LSL:
-                self.signal_latch_arithmetical_logical_unit(select=[2, 3, 3, 3, 7])
-                self.signal_latch_accumulator_register(select=1)
-                self.perform_tick()
-            case Opcode.ASR:
-                self.signal_latch_arithmetical_logical_unit(select=[2, 3, 3, 3, 8])
-                self.signal_latch_accumulator_register(select=1)
-                self.perform_tick()
-            case Opcode.JMP:
-                self.signal_latch_programm_counter_register(select=0)
-                self.perform_tick()
-            case Opcode.JZ:
-                if self._data_path.zero():
-                    self.perform_tick()
-                    self.signal_latch_programm_counter_register(select=0)
-                self.perform_tick()
-            case Opcode.JNZ:
-                if not self._data_path.zero():
-                    self.perform_tick()
-                    self.signal_latch_programm_counter_register(select=0)
-                self.perform_tick()
-            case Opcode.JN:
-                if self._data_path.negative():
-                    self.perform_tick()
-                    self.signal_latch_programm_counter_register(select=0)
-                self.perform_tick()
-            case Opcode.JP:
-                if not self._data_path.negative():
-                    self.perform_tick()
-                    self.signal_latch_programm_counter_register(select=0)
-                self.perform_tick()
-            case Opcode.INT:
-                self._prepare_for_interruption()
-            case Opcode.FI:
-                # Чтение из памяти значение счётчика команд
-                self.signal_latch_address_register(select=3)
-                self.perform_tick()
-                self.signal_latch_buffer_register(select=1)
-                self.perform_tick()
-                self.signal_latch_programm_counter_register(select=0)
-                self.perform_tick()
-                # Чтение из памяти значения аккумулятора
-                self.signal_latch_address_register(select=2)
-                self.perform_tick()
-                self.signal_latch_accumulator_register(select=0)
-                self.perform_tick()
-                # Обнуление флага обработки прерывания
-                self._interruption_state = False
-            case Opcode.ENI:
-                self._interruption_enabled = True
-                self.perform_tick()
-            case Opcode.DII:
-                self._interruption_enabled = False
-                self.perform_tick()
-            case Opcode.NOP:
-                self.perform_tick()
-            case Opcode.HLT:
-                raise StopIteration()
-            case _:
-                raise_error("Unknown opcode in instruction execute cycle")
+        """Цикл исполнения команды."""
+        self._execution_handler(self)
 
     def _check_interruption(self) -> None:
         """Цикл обработки прерываний."""
-        if self._interruption_request and self._interruption_enabled and not self._interruption_state:
+        if self._interruption_requests and self._interruption_enabled and not self._interruption_state:
             self.signal_latch_buffer_register(select=2)
             self._prepare_for_interruption()
 
@@ -879,7 +1097,49 @@ class ControlUnit:
         self._decode_instruction()
         self._select_argumet()
         self._execute_instruction()
-        self._check_interruption()
+        # Проверка наличия запросов прерывания выполняется на месте: без запросов цикл обработки прерываний не вызывается
+        if self._interruption_requests:
+            self._check_interruption()
+
+    _MODE_TABLE: ClassVar[dict[Mode | None, Callable[[ControlUnit], None]]] = {
+        Mode.VALUE: _fetch_value,
+        Mode.DIRECT: _fetch_direct,
+        Mode.INDIRECT: _fetch_indirect,
+        None: _fetch_none,
+    }
+    """ Таблица циклов выборки аргумента по режиму адресации."""
+
+    _OPCODE_TABLE: ClassVar[dict[Opcode, Callable[[ControlUnit], None]]] = {
+        Opcode.LD: _alu_execution_handler(_ALU_SELECT_LD),
+        Opcode.ST: _execute_st,
+        Opcode.IN: _execute_in,
+        Opcode.OUT: _execute_out,
+        Opcode.ADD: _alu_execution_handler(_ALU_SELECT_ADD),
+        Opcode.SUB: _alu_execution_handler(_ALU_SELECT_SUB),
+        Opcode.CMP: _execute_cmp,
+        Opcode.INC: _alu_execution_handler(_ALU_SELECT_INC),
+        Opcode.DEC: _alu_execution_handler(_ALU_SELECT_DEC),
+        Opcode.MUL: _alu_execution_handler(_ALU_SELECT_MUL),
+        Opcode.DIV: _alu_execution_handler(_ALU_SELECT_DIV),
+        Opcode.MOD: _alu_execution_handler(_ALU_SELECT_MOD),
+        Opcode.AND: _alu_execution_handler(_ALU_SELECT_AND),
+        Opcode.OR: _alu_execution_handler(_ALU_SELECT_OR),
+        Opcode.LSL: _alu_execution_handler(_ALU_SELECT_LSL),
+        Opcode.ASR: _alu_execution_handler(_ALU_SELECT_ASR),
+        Opcode.JMP: _execute_jmp,
+        Opcode.JZ: _execute_jz,
+        Opcode.JNZ: _execute_jnz,
+        Opcode.JN: _execute_jn,
+        Opcode.JP: _execute_jp,
+        Opcode.INT: _execute_int,
+        Opcode.FI: _execute_fi,
+        Opcode.ENI: _execute_eni,
+        Opcode.DII: _execute_dii,
+        # Цикл исполнения NOP состоит из одного такта
+        Opcode.NOP: perform_tick,
+        Opcode.HLT: _execute_hlt,
+    }
+    """ Таблица обработчиков цикла исполнения по коду операции."""
 
 
 class Machine:
@@ -913,14 +1173,27 @@ class Machine:
     _output_buffer: list[str]
     """ Буффер выходных данных для пользователя"""
 
-    def __init__(
-        self, memory_size: int = 4096, io_devices: dict[int, IO.IODeviceCommon] = {7: IO.IODeviceConsole()}
-    ) -> None:
+    _pending_output: list[int]
+    """ Данные, полученные устройством вывода за время исполнения текущей инструкции."""
+
+    _printed_output: int
+    """ Кол-во символов буфера выходных данных, уже выведенных пользователю."""
+
+    verbose: bool | None
+    """ Журналирование состояния машины на каждом такте.
+
+    Если не задано, определяется уровнем журналирования (INFO) при запуске симуляции.
+    """
+
+    def __init__(self, memory_size: int = 4096, io_devices: dict[int, IO.IODeviceCommon] | None = None) -> None:
         assert memory_size > 0, "Memory size should not be zero."
+        # Устройства по умолчанию создаются для каждой машины: устройства хранят ссылки на шину и буферы своей машины
+        if io_devices is None:
+            io_devices = {7: IO.IODeviceConsole()}
         self._memory_size = memory_size
         # Возможность для использования стека, если задавать размер памяти больший,чем количество машинных выражений
         self._common_memory = [
-            MachineWordData(index=index, label=index, value=0, line=0) for index in range(0, memory_size)
+            MachineWordData(index=index, label=str(index), value=0, line=0) for index in range(0, memory_size)
         ]
         self._data_bus = DataBus(io_devices)
         self._int_line = InterruptionLine(self, io_devices)
@@ -930,35 +1203,19 @@ class Machine:
             common_memory=self._common_memory, data_path=self._data_path, io_controller=self._io_controller
         )
         self._output_buffer = []
+        self._pending_output = []
+        self._printed_output = 0
+        for device in io_devices.values():
+            if isinstance(device, IO.IODeviceConsole):
+                device._before_input = functools.partial(self._flush_output, force=True)
+        # Устройство вывода само сообщает машине о новых данных
+        if 2 in io_devices:
+            io_devices[2]._on_new_data = self._pending_output.append
+        self.verbose = None
 
     def __repr__(self) -> str:
         """Вернуть строковое представление состояния процессора."""
-        assert self._control_unit._instruction_register is not None
-        device_state: str = ""
-        if self._control_unit._instruction_register.opcode in [Opcode.IN, Opcode.OUT]:
-            io_port: int = self._control_unit._instruction_register.arg
-            device_index: int = io_port // 2 + 1
-            device_state = (
-                "\n\t Dev: {} | Port: {} | ".format(device_index, io_port)
-                + self._io_controller._connected_devices.get(device_index).__repr__()
-            )
-        return (
-            "TICK: {:3} | PC: {:3} | IR: '{:^11}' | IRQ: {} | IE: {} | IS: {} | AC: {:^10} | BR: {:3} | AR: {:3} | MEM_AR: {} | N: {} | Z: {}".format(
-                self._control_unit.get_tick(),
-                self._control_unit._programm_counter_register,
-                self._control_unit._instruction_register.opcode,
-                bool2int(self._control_unit._interruption_request),
-                bool2int(self._control_unit._interruption_enabled),
-                bool2int(self._control_unit._interruption_state),
-                self._control_unit._data_path._accumulator_register,
-                self._control_unit._data_path._buffer_register,
-                self._control_unit._data_path._address_register,
-                self._control_unit._data_path._read_memory(),
-                bool2int(self._control_unit._data_path.negative()),
-                bool2int(self._control_unit._data_path.zero()),
-            )
-            + device_state
-        )
+        return self._control_unit.__repr__()
 
     @staticmethod
     def parse_schedule(list_tuple_text: str) -> list[tuple[int, str]]:
@@ -966,77 +1223,179 @@ class Machine:
         list_schedule: list[tuple[int, str]] = list(eval(list_tuple_text)) if list_tuple_text.strip() != "" else []
         return list_schedule
 
-    def request_new_int(self, input_schedule: list[tuple[int, str]], cur_schedule: int) -> None:
+    @staticmethod
+    def pack_schedule(input_schedule: list[tuple[int, str]]) -> tuple[array[int], array[int]]:
+        """Разделение расписания ввода на массивы тактов подачи символов и 8-битных кодов символов."""
+        schedule_ticks: array[int] = array("q", [tick for tick, _ in input_schedule])
+        schedule_symbols: array[int] = array("B", [ord(symbol) & 0xFF for _, symbol in input_schedule])
+        return (schedule_ticks, schedule_symbols)
+
+    @staticmethod
+    def parse_binary_schedule(schedule_bytes: bytes) -> tuple[array[int], array[int]]:
+        """Парсинг расписания ввода из бинарного формата.
+
+        Расписание - последовательность записей SCHEDULE_RECORD_FORMAT: такт подачи символа (i64, little-endian)
+        и код символа (u8). Возвращает массивы тактов и кодов символов, как `pack_schedule`.
+
+        Коды символов выбираются срезом с шагом записи, такты - из байтов расписания без кодов символов.
+        """
+        if len(schedule_bytes) % SCHEDULE_RECORD_SIZE != 0:
+            raise ValueError(
+                "Binary schedule size ({} bytes) should be a multiple of {} bytes.".format(
+                    len(schedule_bytes), SCHEDULE_RECORD_SIZE
+                )
+            )
+        schedule_symbols: array[int] = array("B", schedule_bytes[_SCHEDULE_SYMBOL_OFFSET::SCHEDULE_RECORD_SIZE])
+        ticks_bytes: bytearray = bytearray(schedule_bytes)
+        del ticks_bytes[_SCHEDULE_SYMBOL_OFFSET::SCHEDULE_RECORD_SIZE]
+        schedule_ticks: array[int] = array("q")
+        schedule_ticks.frombytes(ticks_bytes)
+        if sys.byteorder != "little":
+            schedule_ticks.byteswap()
+        return (schedule_ticks, schedule_symbols)
+
+    def request_new_int(self, schedule_symbols: array[int], cur_schedule: int) -> None:
         """Установка нового значения в регистр данных устрйоства ввода, установка флага новых данных и запрос прерывания."""
-        if self._io_controller._connected_devices[1]._new_data is True:
-            self._io_controller._connected_devices[1]._data_register = ord(input_schedule[cur_schedule][1])
-            self._io_controller._connected_devices[1].signal_int_request()
-            logging.info("\tInput {} << '{}'".format(1, ord(input_schedule[cur_schedule][1])))
+        input_device: IO.IODeviceCommon = self._io_controller._connected_devices[1]
+        if input_device._new_data is True:
+            input_device._data_register = schedule_symbols[cur_schedule]
+            input_device.signal_int_request()
+            # Форматирование откладывается до вывода записи журнала
+            logging.info("\tInput %d << '%d'", 1, schedule_symbols[cur_schedule])
 
     def input_schedule_management(
-        self, input_schedule: list[tuple[int, str]] = [], cur_schedule: int | None = None
+        self, schedule_ticks: array[int], schedule_symbols: array[int], cur_schedule: int | None = None
     ) -> int | None:
         """Управление вводом/выводом по расписанию.
 
+        Расписание передаётся двумя массивами одинаковой длины: тактами подачи символов и кодами символов.
+
         Возвращает вычисленное значение текущего указателя на запрос ввода/вывода."""
-        cur_tick: int = self._control_unit.get_tick()
-        if cur_schedule is not None and cur_tick >= input_schedule[cur_schedule][0]:
-            next_int_tick: int | None
-            try:
-                next_int_tick = input_schedule[cur_schedule + 1][0]
-            except IndexError:
-                next_int_tick = None
-            if next_int_tick is None:
-                if self._io_controller._connected_devices[1]._data_register == 0:
-                    self._io_controller._connected_devices[1]._new_data = True
-                self.request_new_int(input_schedule, cur_schedule)
-                cur_schedule = None
-            else:
-                if next_int_tick <= cur_tick:
-                    cur_schedule += 1
-                    self._io_controller._connected_devices[1]._new_data = True
-                    self.request_new_int(input_schedule, cur_schedule)
-                    cur_schedule += 1
-                else:
-                    if self._io_controller._connected_devices[1]._data_register == 0:
-                        self._io_controller._connected_devices[1]._new_data = True
-                    self.request_new_int(input_schedule, cur_schedule)
-                    cur_schedule += 1
-        return cur_schedule
+        cur_tick: int = self._control_unit._tick
+        if cur_schedule is None or cur_tick < schedule_ticks[cur_schedule]:
+            return cur_schedule
+        input_device: IO.IODeviceCommon = self._io_controller._connected_devices[1]
+        next_int_tick: int | None = schedule_ticks[cur_schedule + 1] if cur_schedule + 1 < len(schedule_ticks) else None
+        if next_int_tick is not None and next_int_tick <= cur_tick:
+            # Следующий символ также просрочен: подаётся он, а текущий пропускается
+            cur_schedule += 1
+            input_device._new_data = True
+        elif input_device._data_register == 0:
+            input_device._new_data = True
+        self.request_new_int(schedule_symbols, cur_schedule)
+        return cur_schedule + 1 if next_int_tick is not None else None
+
+    @staticmethod
+    def next_input_tick(schedule_ticks: array[int], cur_schedule: int | None) -> int:
+        """Такт следующего запроса ввода по расписанию.
+
+        Если расписание пусто или исчерпано, возвращается sys.maxsize.
+        """
+        if cur_schedule is None or cur_schedule >= len(schedule_ticks):
+            return sys.maxsize
+        return schedule_ticks[cur_schedule]
+
+    def set_verbose(self, verbose: bool) -> None:
+        """Включение/выключение журналирования состояния машины на каждом такте.
+
+        Применяется при следующем запуске симуляции.
+        """
+        self.verbose = verbose
+
+    def _flush_output(self, force: bool = False) -> None:
+        """Вывод пользователю накопленных символов буфера выходных данных.
+
+        Символы выводятся одной записью по завершении строки или накоплении `OUTPUT_CHUNK_SIZE` символов,
+        а не по одному вызову print на символ.
+        """
+        unprinted: int = len(self._output_buffer) - self._printed_output
+        if unprinted and (force or unprinted >= OUTPUT_CHUNK_SIZE or self._output_buffer[-1] == "\n"):
+            sys.stdout.write("".join(self._output_buffer[self._printed_output :]))
+            self._printed_output = len(self._output_buffer)
+
+    @staticmethod
+    def _log_output(output_buffer: list[str], symbol_code: int) -> None:
+        """Журналирование нового символа вывода от имени вызывающей функции (`simulation`).
+
+        Копия буфера снимается только здесь, поэтому при отключенном уровне INFO (см. `_skip_log`)
+        на символ вывода не тратится O(N) работы.
+        """
+        logging.info("output: %s << %s", output_buffer.copy(), symbol_code, stacklevel=2)
+
+    @staticmethod
+    def _skip_log(*args: object) -> None:
+        """Заглушка журналирования вывода при отключенном уровне INFO."""
 
     def simulation(
-        self, code: Code, input_schedule: list[tuple[int, str]] = [], limit: int = 1000
+        self,
+        code: Code,
+        input_schedule: list[tuple[int, str]] = [],
+        limit: int = 1000,
+        packed_schedule: tuple[array[int], array[int]] | None = None,
     ) -> tuple[str, int, int]:
         """Подготовка модели и запуск симуляции процессора.
 
+        Расписание ввода передаётся либо списком пар (такт, символ), либо уже разделённым на массивы
+        тактов и кодов символов (см. `pack_schedule`, `parse_binary_schedule`).
+
+        Уровень журналирования проверяется один раз при запуске: чтобы изменить его во время симуляции,
+        её необходимо запустить заново.
+
         Возвращает вывод программы, значение счётчика команд и кол-во исполненных тактов.
         """
         assert limit > 0, "Simulation failed: Limit can not be negative or zero."
+        info_on: bool = self.verbose if self.verbose is not None else logging.getLogger().isEnabledFor(logging.INFO)
+        self._control_unit.trace_ticks = info_on
         self._common_memory[: len(code.contents)] = code.contents
-        cur_schedule: int | None = 0 if len(input_schedule) > 0 else None
+        # Содержимое памяти вне загружаемой программы не изменилось с предыдущей загрузки
+        self._data_path.load_memory_values(len(code.contents))
+        self._control_unit.specialize_programm(len(code.contents))
+        # Такты и коды символов расписания хранятся отдельно, символы - как 8-битные значения регистра данных
+        schedule_ticks, schedule_symbols = (
+            packed_schedule if packed_schedule is not None else Machine.pack_schedule(input_schedule)
+        )
+        cur_schedule: int | None = 0 if len(schedule_ticks) > 0 else None
+        next_input_tick: int = Machine.next_input_tick(schedule_ticks, cur_schedule)
+        pending_output: list[int] = self._pending_output
+        log_output: Callable[[list[str], int], None] = Machine._log_output if info_on else Machine._skip_log
+        control_unit: ControlUnit = self._control_unit
+        execute_next_command: Callable[[], None] = control_unit.execute_next_command
+        instruction_count: int = self.instruction_count
+        output_buffer: list[str] = self._output_buffer
+        connected_devices: dict[int, IO.IODeviceCommon] = self._io_controller._connected_devices
         try:
-            while self._control_unit.get_tick() < limit:
+            while control_unit._tick < limit:
                 # Логика управлением расписания ввода
-                cur_schedule = self.input_schedule_management(input_schedule, cur_schedule)
+                if control_unit._tick >= next_input_tick:
+                    cur_schedule = self.input_schedule_management(schedule_ticks, schedule_symbols, cur_schedule)
+                    next_input_tick = Machine.next_input_tick(schedule_ticks, cur_schedule)
                 # Выполнение очередной инструкции
-                self._control_unit.execute_next_command()
-                self.instruction_count += 1
+                execute_next_command()
+                instruction_count += 1
                 # logging.info(self.__repr__())  # instr repr  # noqa: ERA001 need in case per-instruction bedug
                 # Сбор данных с устройств вывода
-                if self._io_controller._connected_devices[2]._new_data is True:
-                    new_symbol: str = chr(self._io_controller._connected_devices[2]._data_register)
-                    self._output_buffer.append(new_symbol)
-                    self._io_controller._connected_devices[2]._new_data = False
-                    logging.info("output: {} << {}".format(self._output_buffer, str(ord(new_symbol))))
-                    print(new_symbol, end="")
+                if pending_output:
+                    for symbol_code in pending_output:
+                        new_symbol: str = _CHR[symbol_code] if 0 <= symbol_code < 256 else chr(symbol_code)
+                        output_buffer.append(new_symbol)
+                        # Сообщение форматируется журналом только при записи; буфер передаётся копией, т.к. изменяется далее
+                        log_output(output_buffer, symbol_code)
+                    pending_output.clear()
+                    connected_devices[2]._new_data = False
+                    self._flush_output()
         except StopIteration:
             logging.info(self._control_unit.__repr__())
+        finally:
+            self.instruction_count = instruction_count
+            self._flush_output(force=True)
+            self._data_path.store_memory_values()
 
         if self._control_unit.get_tick() >= limit:
             logging.warning("Instruction limit exceeded!")
-        logging.info("Output buffer:" + repr("".join(self._output_buffer)))
+        output: str = "".join(self._output_buffer)
+        logging.info("Output buffer:%r", output)
         return (
-            "".join(self._output_buffer),
+            output,
             self.instruction_count,
             self._control_unit.get_tick(),
         )
@@ -1045,9 +1404,11 @@ class Machine:
 def main(code_file: str, input_file_name: str) -> None:
     """Функция запуска модели процессора. Параметры -- имена файлов с машинным
     кодом и с входными данными для симуляции ввода (формат [<такт подачи символа>, <символ>]).
+
+    Файл расписания с расширением `.bin` читается в бинарном формате (см. `Machine.parse_binary_schedule`).
     """
-    machine: Machine
     code: Code
+    packed_schedule: tuple[array[int], array[int]]
 
     try:
         code = read_code(code_file)
@@ -1057,20 +1418,28 @@ def main(code_file: str, input_file_name: str) -> None:
         return
 
     try:
-        with open(input_file_name, encoding="utf-8") as file:
-            input_text: str = file.read()
-            input_schedule: list[tuple[int, str]] = Machine.parse_schedule(input_text)
-            logging.info("Schedule: {}".format(input_schedule))
+        if Path(input_file_name).suffix == ".bin":
+            packed_schedule = Machine.parse_binary_schedule(Path(input_file_name).read_bytes())
+            logging.info("Schedule: %s records", len(packed_schedule[0]))
+        else:
+            with open(input_file_name, encoding="utf-8") as file:
+                input_text: str = file.read()
+                input_schedule: list[tuple[int, str]] = Machine.parse_schedule(input_text)
+                logging.info("Schedule: %s", input_schedule)
+            packed_schedule = Machine.pack_schedule(input_schedule)
     except FileNotFoundError as e:
         logging.error(e)
         return
+    except ValueError as e:
+        logging.error("Schedule file %s can not be loaded: %s", input_file_name, e)
+        return
 
     io_devices: dict[int, IO.IODeviceCommon] = {index: IO.IODeviceCommon() for index in [1, 2]}
     io_devices.update({7: IO.IODeviceConsole()})
     machine = Machine(memory_size=len(code.contents), io_devices=io_devices)
 
     try:
-        output, instr_counter, ticks = machine.simulation(code=code, input_schedule=input_schedule, limit=75000)
+        output, instr_counter, ticks = machine.simulation(code=code, packed_schedule=packed_schedule, limit=75000)
     except ValueError as e:
         # use logging.exception to see the stacktrace
         logging.error(
@@ -1085,11 +1454,7 @@ def main(code_file: str, input_file_name: str) -> None:
         logging.error(e.args[0])
         return
 
-    logging.info(
-        "instr_counter: {} ticks: {}".format(
-            machine.instruction_count, machine._control_unit.get_tick()
-        )
-    )
+    logging.info("instr_counter: %s ticks: %s", machine.instruction_count, machine._control_unit.get_tick())
 
 
 if __name__ == "__main__":
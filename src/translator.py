@@ -3,7 +3,11 @@ from __future__ import annotations
 import logging
 import re
 import sys
-from re import Match
+from collections.abc import Iterable, Mapping
+from itertools import repeat
+from re import Pattern
+from types import MappingProxyType
+from typing import Final
 
 from isa import (
     Code,
@@ -18,143 +22,137 @@ from isa import (
 )
 from machine import get_interruption_vector_length
 
+# Термы строки за один проход: строковый литерал, специальный символ или последовательность прочих символов.
+# Посимвольный разбор строки в Python (таблица разделителей) примерно вдвое медленнее одного findall.
+_LINE_TERMS: Final[Pattern[str]] = re.compile(r'"[^"]*"|[:;,*"]|[^\s:;,*"]+')
 
-def avaliable_sections() -> dict[str, str]:
+# Имя лейбла: латинская буква или '_', далее буквы, цифры или '_'; проверяется только при объявлении лейбла
+_LABEL_NAME: Final[Pattern[str]] = re.compile(r"[a-zA-Z_]\w*")
+
+# Целое число со знаком: нечисловые термы отсекаются до вызова int()
+_INTEGER: Final[Pattern[str]] = re.compile(r"[+-]?\d+")
+
+# Режим адресации аргумента по числу операторов '*' в выражении
+_MODE_BY_DEREF_COUNT: Final[tuple[Mode, ...]] = (Mode.VALUE, Mode.DIRECT, Mode.INDIRECT)
+
+# Имена секций интернируются: ключи словаря секций программы совпадают с ними по идентичности
+_SECTION_DATA: Final[str] = sys.intern(".data")
+
+_SECTION_TEXT: Final[str] = sys.intern(".text")
+
+_AVALIABLE_SECTIONS: Final[Mapping[str, str]] = MappingProxyType(
+    {_SECTION_DATA: "section .data", _SECTION_TEXT: "section .text"}
+)
+
+_SYMBOLS: Final[frozenset[str]] = frozenset({":", "*", ",", ";", "'", '"'})
+
+# Команда исходного кода - имя кода операции в нижнем регистре
+_INSTRUCTION_TO_OPCODE: Final[Mapping[str, Opcode]] = MappingProxyType(
+    {opcode.name.lower(): opcode for opcode in Opcode}
+)
+
+_INSTRUCTIONS: Final[frozenset[str]] = frozenset(_INSTRUCTION_TO_OPCODE)
+
+_CONTROL_FLOW_OPERATIONS: Final[frozenset[Opcode]] = frozenset(Opcode.control_flow_operations())
+
+_DATA_MANIPULATION_OPERATIONS: Final[frozenset[Opcode]] = frozenset(Opcode.data_manipulation_operations())
+
+_UNARY_OPERATIONS: Final[frozenset[Opcode]] = frozenset(Opcode.unary_operations())
+
+_NO_OPERAND_OPERATIONS: Final[frozenset[Opcode]] = frozenset(Opcode.no_operand_operations())
+
+# Категория команды с одним аргументом: True - управление потоком исполнения, False - операция над данными
+_IS_CONTROL_FLOW_OPERATION: Final[Mapping[Opcode, bool]] = MappingProxyType(
+    {opcode: False for opcode in _DATA_MANIPULATION_OPERATIONS} | {opcode: True for opcode in _CONTROL_FLOW_OPERATIONS}
+)
+assert len(_IS_CONTROL_FLOW_OPERATION) == len(_DATA_MANIPULATION_OPERATIONS) + len(
+    _CONTROL_FLOW_OPERATIONS
+), "Translation bug: ISA has opcodes in both control flow and data manipulation groups"
+
+# Арность команды: True - команда с одним аргументом, False - команда без аргументов
+_IS_UNARY_OPERATION: Final[Mapping[Opcode, bool]] = MappingProxyType(
+    {opcode: False for opcode in _NO_OPERAND_OPERATIONS} | {opcode: True for opcode in _UNARY_OPERATIONS}
+)
+assert (
+    len(_IS_UNARY_OPERATION) == len(Opcode) == len(_UNARY_OPERATIONS) + len(_NO_OPERAND_OPERATIONS)
+), "Translation bug: ISA represents opcode arity incorrectly"
+
+
+def avaliable_sections() -> Mapping[str, str]:
     """Константный словарь с опустимыми именами секций и их представлении в коде программ."""
-    return {".data": "section .data", ".text": "section .text"}
+    return _AVALIABLE_SECTIONS
 
 
-def symbols() -> set[str]:
+def symbols() -> frozenset[str]:
     """Полное множество символов, доступных к использованию в языке.
 
     Используется для парсинга секций данных и определения способа адресации лейблов.
     """
-    return {":", "*", ",", ";", "'", '"'}
+    return _SYMBOLS
 
 
-def instructions() -> set[str]:
+def instructions() -> frozenset[str]:
     """Полное множество команд, доступных к использованию в языке."""
-    return {opcode.name.lower() for opcode in Opcode}
+    return _INSTRUCTIONS
 
 
 def map_instruction_to_opcode(instruction: str) -> Opcode | None:
     """Отображение команд исходного кода в коды операций."""
-    return {
-        "ld": Opcode.LD,
-        "st": Opcode.ST,
-        "out": Opcode.OUT,
-        "in": Opcode.IN,
-        "add": Opcode.ADD,
-        "sub": Opcode.SUB,
-        "cmp": Opcode.CMP,
-        "inc": Opcode.INC,
-        "dec": Opcode.DEC,
-        "mul": Opcode.MUL,
-        "div": Opcode.DIV,
-        "mod": Opcode.MOD,
-        "or": Opcode.OR,
-        "and": Opcode.AND,
-        "lsl": Opcode.LSL,
-        "asr": Opcode.ASR,
-        "jmp": Opcode.JMP,
-        "jz": Opcode.JZ,
-        "jnz": Opcode.JNZ,
-        "jn": Opcode.JN,
-        "jp": Opcode.JP,
-        "int": Opcode.INT,
-        "fi": Opcode.FI,
-        "eni": Opcode.ENI,
-        "dii": Opcode.DII,
-        "hlt": Opcode.HLT,
-        "nop": Opcode.NOP,
-    }.get(instruction)
+    return _INSTRUCTION_TO_OPCODE.get(instruction)
 
 
 def try_convert_str_to_int(num_str: str) -> int | None:
-    """Конвертация строки в число, если это возможно."""
-    try:
-        return int(num_str)
-    except ValueError:
-        return None
-
+    """Конвертация строки в число, если это возможно.
 
-def split_by_spec_symbols(elem: str) -> list[str]:
-    """Разделение строки исходной программы согласно грамматике языка"""
-    tmp: list[str] = re.split(r"(\:|\;|\,|\*|\")", elem)
-    while "" in tmp:
-        tmp.remove("")
-    return tmp
-
-
-def filter_comments_on_line(terms: list[str]) -> list[str]:
-    """Убрать все символы после символа начала комментариев."""
-    term_num: int
-    comment_start: int | None = None
-    for term_num, term in enumerate(terms):
-        if term == ";":
-            comment_start = term_num
-            break
-    if comment_start is not None:
-        terms = terms[:comment_start]
-    return terms
-
-
-def count_inverted_commas(term: str) -> int:
-    """Подсчёт кавычек в терме данных со строковыми литералами."""
-    ic_amount: int = 0
-    for symb in term:
-        if symb == '"':
-            ic_amount += 1
-    return ic_amount
+    Нечисловые термы (например, лейблы) отсекаются регулярным выражением, без исключения ValueError.
+    """
+    if _INTEGER.fullmatch(num_str) is None:
+        return None
+    return int(num_str)
 
 
-def get_literal_from_line(line: str) -> tuple[str | None, str]:
-    """Выделение значения строкового литерала из строки.
+def split_literal_line_to_terms(line: str) -> list[str]:
+    """Разделение строки исходного кода со строковыми литералами на термы с отбрасыванием комментария.
 
-    Возвращает найденный литерал и строку без этого литерала.
+    Первый строковый литерал строки (в том числе в комментарии) переносится в конец списка термов,
+    остальные литералы отбрасываются.
     """
-    pattern: str = r"(\".*?\")"
-    literal: Match[str] | None = re.search(pattern, line)
+    literal: str | None = None
+    terms: list[str] = []
+    in_comment: bool = False
+    for match in _LINE_TERMS.finditer(line):
+        term: str = match.group()
+        # Одиночная кавычка без пары - специальный символ, а не литерал
+        if len(term) > 1 and term[0] == '"':
+            if literal is None:
+                literal = term
+        elif term == ";":
+            in_comment = True
+        elif not in_comment:
+            terms.append(term)
     if literal is not None:
-        line = re.sub(pattern, "", line)
-        return (literal.group(0), line)
-    return (None, line)
+        terms.append(literal)
+    return terms
 
 
 def split_programm_line_to_terms(line: str) -> list[str]:
-    """Разделение одной строки исходного кода на термы."""
-    literal: str | None = None
-    complete_terms: list[str] = []
-    tmp: list[str] = []
-
-    line = line.strip()
-    literal, line = get_literal_from_line(line)
-    terms: list[str] = line.split()
-    for term in terms:
-        tmp = split_by_spec_symbols(term)
-        complete_terms.extend(tmp)
-    complete_terms = filter_comments_on_line(complete_terms)
-    if literal is not None:
-        complete_terms.append(literal)
-    return complete_terms
+    """Разделение одной строки исходного кода на термы с отбрасыванием комментария."""
+    if '"' in line:
+        return split_literal_line_to_terms(line)
+    # Строка без литералов (большинство строк): комментарий отбрасывается до разбора,
+    # и разбор выполняется целиком в регулярном выражении, без цикла по термам
+    return _LINE_TERMS.findall(line.partition(";")[0])
 
 
 def split_text_to_source_terms(programm_text: str) -> list[SourceTerm]:
     """Разделение секции кода исходной программы на термы."""
-    source_terms: list[SourceTerm] = []
-    term_line: list[str] = []
-    # Нумерация строк исходного кода
-    for line_num, line in enumerate(programm_text.split("\n"), 1):
-        term_line = split_programm_line_to_terms(line)
-        if len(term_line) == 0:
-            continue
-        source_terms.append(SourceTerm(line_num, term_line))
-    return source_terms
-
-
-def select_sections_terms(section_source_terms: list[SourceTerm]) -> list[SourceTerm]:
-    """Поиск строк-термов, содержащих ключевое слово 'sections'."""
-    return [term for term in section_source_terms if "section" in term.terms]
+    # Нумерация строк исходного кода; пустые строки и строки только с комментарием пропускаются.
+    # Пустые строки отсекаются до разбора; строки с комментарием разбираются, так как литерал в комментарии - терм
+    return [
+        SourceTerm(line_num, term_line)
+        for line_num, line in enumerate(programm_text.split("\n"), 1)
+        if line and not line.isspace() and (term_line := split_programm_line_to_terms(line))
+    ]
 
 
 def validate_section_name(section_definition: SourceTerm) -> str:
@@ -162,106 +160,42 @@ def validate_section_name(section_definition: SourceTerm) -> str:
     assert (
         len(section_definition.terms) >= 3
     ), "Translation failed: Sections definition should contain 3 terms, line: {}.".format(section_definition.line)
-    section_found: bool = False
-    section_name: str | None = None
-
-    for term_num, term in enumerate(section_definition.terms):
-        match term_num:
-            case 0:
-                assert (
-                    term == "section"
-                ), "Translation failed: Section definition doesn't have 'section' keyword in place."
-                assert not section_found, "Translation failed: Multiple section defenitions in line: {}.".format(
-                    section_definition.line
-                )
-                section_found = True
-                continue
-            case 1:
-                assert (
-                    term in avaliable_sections().keys()
-                ), "Translation failed: Unavaliable section name: {}, line: {}.".format(term, section_definition.line)
-                section_name = term
-                continue
-            case 2:
-                assert term == ":", "Translation failed: Section name should be followed by colon, line:{}.".format(
-                    section_definition.line
-                )
-                continue
-            case 3:
-                assert term == ";", "Translation failed: Section definition could be followed only by comment."
-            case _:
-                continue
-    assert section_name is not None, "Translation failed: Section name not found, line: {}.".format(
+    # Объявление секции разбирается по позициям термов: ключевое слово, имя секции, двоеточие
+    keyword, section_name, colon, *rest = section_definition.terms
+    assert keyword == "section", "Translation failed: Section definition doesn't have 'section' keyword in place."
+    assert section_name in _AVALIABLE_SECTIONS, "Translation failed: Unavaliable section name: {}, line: {}.".format(
+        section_name, section_definition.line
+    )
+    assert colon == ":", "Translation failed: Section name should be followed by colon, line:{}.".format(
         section_definition.line
     )
-    return section_name
-
-
-def validate_section_names(section_source_terms: list[SourceTerm]) -> bool:
-    """Валидация названий секций в программе."""
-    unique_avaliable_sections: set[str] = set()
-    for source_term in section_source_terms:
-        section_name: str = validate_section_name(source_term)
-        assert (
-            section_name not in unique_avaliable_sections
-        ), "Translation failed: Section name should be unique: {}.".format(source_term.line)
-        if section_name in unique_avaliable_sections:
-            return False
-        unique_avaliable_sections.update(section_name)
-    return True
+    assert not rest or rest[0] == ";", "Translation failed: Section definition could be followed only by comment."
+    return sys.intern(section_name)
 
 
 def split_source_terms_to_sections(programm_text_split: list[SourceTerm]) -> dict[str, list[SourceTerm]]:
     """Разделение исходного кода программы по секциям для отдельной обработки.
 
+    Секции выделяются за один проход: объявление секции проверяется и открывает новую секцию,
+    остальные термы добавляются в текущую секцию. Термы до первого объявления секции не относятся ни к одной секции.
+
     Возвращаемые значения в словаре:
     - сокращенное имя секции .data и термы строк
     - сокращенное имя секции .text и термы строк
     """
     sections: dict[str, list[SourceTerm]] = dict()
-    sections_starts: dict[str, tuple[int, SourceTerm]] = dict()
-
-    # Находим все секции и проверяем их объявления на корректность.
-    section_expressions: list[SourceTerm] = select_sections_terms(programm_text_split)
-    assert len(section_expressions) > 0, "Translation failed: No sections in programm."
-    assert validate_section_names(section_expressions), "Translation failed: Section definition is not correct"
-
-    # Сохраняем термы исходгого кода с порядковыми номерами после фильтрации от комментариев
-    terms_by_line: list[tuple[int, SourceTerm]] = [
-        (term_num, term) for term_num, term in enumerate(programm_text_split)
-    ]
+    current_section: list[SourceTerm] | None = None
 
-    # Cохраняем начала доступных секций.
-    for section in section_expressions:
-        section_start: int | None = None
-        for term in terms_by_line:
-            if section == term[1]:
-                section_start = term[0]
-        assert section_start is not None, "Translation failed: Section start is not found"
-        sections_starts[section.terms[1]] = (section_start, section)
-
-    # Добавляем каждой секции в выходной структуре её содержимое без заголовка секции
-    prev_name: str | None = None
-    prev_pos: int | None = None
-    prev_source_term: SourceTerm | None = None
-    section_programm_start: int
-    section_programm_end: int
-    for name, pos_term in sections_starts.items():
-        if prev_name is not None and prev_pos is not None and prev_source_term is not None:
-            section_programm_start = prev_pos + 1
-            section_programm_end = pos_term[0]
-            sections[prev_name] = [
-                pos_term[1] for pos_term in terms_by_line[section_programm_start:section_programm_end]
-            ]
-        prev_name = name
-        prev_pos = pos_term[0]
-        prev_source_term = pos_term[1]
-    assert prev_name is not None
-    assert prev_pos is not None
-    assert prev_source_term is not None
-    section_programm_start = prev_pos + 1
-    sections[prev_name] = [pos_term[1] for pos_term in terms_by_line[section_programm_start:]]
+    for term in programm_text_split:
+        if "section" not in term.terms:
+            if current_section is not None:
+                current_section.append(term)
+            continue
+        section_name: str = validate_section_name(term)
+        assert section_name not in sections, "Translation failed: Section name should be unique: {}.".format(term.line)
+        current_section = sections[section_name] = []
 
+    assert len(sections) > 0, "Translation failed: No sections in programm."
     return sections
 
 
@@ -272,39 +206,32 @@ def match_label(term: SourceTerm) -> str | None:
     """
     line: list[str] = term.terms
     # Проверка: есть ли в строке исходного кода двоеточие
-    try:
-        line.index(":")
-    except ValueError:
+    if ":" not in line:
         return None
     assert len(line) >= 2 and line[1] == ":", "Translation failed: Label name is not correct, line: {}".format(
         term.line
     )
-    assert (
-        line[0] not in instructions()
-    ), "Translation failed: Label name can't be instructuction name, line: {}".format(term.line)
-    res = re.fullmatch(r"[a-zA-Z_][\w]*", line[0], 0)
+    assert line[0] not in _INSTRUCTIONS, "Translation failed: Label name can't be instructuction name, line: {}".format(
+        term.line
+    )
+    res = _LABEL_NAME.fullmatch(line[0])
     assert res is not None, "Translation failed: Label name doesn't match requirements"
-    return line[0]
+    # Лейблы многократно используются как ключи множеств и словарей: интернирование ускоряет их сравнение
+    return sys.intern(line[0])
 
 
 def select_remove_statement_mode(statement: SourceTerm) -> Mode:
-    """Проверка наличия оператора '*' в выражении
-
-    Возвращает соответствующий режим интерпретации аргумента и его позицию в выражении при наличии."""
-    mode: Mode
-    symb_count: int = len([term for term in statement.terms if term == "*"])
-    match symb_count:
-        case 0:
-            mode = Mode.VALUE
-        case 1:
-            mode = Mode.DIRECT
-        case 2:
-            mode = Mode.INDIRECT
-        case _:
-            raise AssertionError(
-                "Translation failed: too much deref symbols for 1 line, line: {}".format(statement.line)
-            )
-    return mode
+    """Проверка наличия оператора '*' в выражении и его удаление из выражения.
+
+    Возвращает режим интерпретации аргумента по числу операторов '*'."""
+    deref_count: int = statement.terms.count("*")
+    assert deref_count < len(
+        _MODE_BY_DEREF_COUNT
+    ), "Translation failed: too much deref symbols for 1 line, line: {}".format(statement.line)
+    # Выражения без косвенной адресации (большинство) не копируются
+    if deref_count > 0:
+        statement.terms[:] = [term for term in statement.terms if term != "*"]
+    return _MODE_BY_DEREF_COUNT[deref_count]
 
 
 def validate_unary_operation_argument(
@@ -315,38 +242,45 @@ def validate_unary_operation_argument(
     Производится проверка аргумента-лейбла на принадлежность тем или иным группам лейблов.
     """
     num_arg: int | None = try_convert_str_to_int(statement.arg)
-    str_arg: str | None = statement.arg if isinstance(statement.arg, str) else None
+    str_arg: str | None = sys.intern(statement.arg) if isinstance(statement.arg, str) else None
 
-    is_control_flow_operation: bool = statement.opcode in Opcode.control_flow_operations()
-    is_data_manipulation_operation: bool = statement.opcode in Opcode.data_manipulation_operations()
+    is_control_flow_operation: bool | None = (
+        _IS_CONTROL_FLOW_OPERATION.get(statement.opcode) if statement.opcode is not None else None
+    )
     assert (
-        is_control_flow_operation ^ is_data_manipulation_operation
+        is_control_flow_operation is not None
     ), "Translation bug: ISA represents opcode '{}' incorrectly, line: {}".format(statement.opcode, statement.line)
     if is_control_flow_operation:
         if num_arg is not None:
             return num_arg
         assert (
-            str_arg in operation_labels | interruption_handler_labels
-            or (str_arg in data_labels and statement.mode in [Mode.DIRECT, Mode.INDIRECT])
+            str_arg in operation_labels
+            or str_arg in interruption_handler_labels
+            or (str_arg in data_labels and (statement.mode is Mode.DIRECT or statement.mode is Mode.INDIRECT))
         ), "Translation failed: control flow instruction argument should be an operation statement label, line: {}".format(
             statement.line
         )
         return str_arg
-    # elif is_data_manipulation_operation
+    # Операция над данными
     if num_arg is None:
         assert (
-            str_arg in data_labels | interruption_handler_labels | operation_labels
+            str_arg in data_labels or str_arg in interruption_handler_labels or str_arg in operation_labels
         ), "Translation failed: data label in argument is not defined, line: {}".format(statement.line)
         return str_arg
     return num_arg
 
 
 def map_term_to_statement(
-    statement: SourceTerm, operation_labels: set[str], data_labels: set[str], interruption_handler_labels: set[str]
+    statement: SourceTerm,
+    label: str | None,
+    operation_labels: set[str],
+    data_labels: set[str],
+    interruption_handler_labels: set[str],
 ) -> StatementTerm:
     """Прербразование выражения текста исходной пргограммы в выражение машинного кода
 
     Преобразование проверяет соответствие аргумента типу операции и оставляет имена лейблов в аргументах.
+    `label` - результат `match_label` для выражения, найденный при сборе лейблов секции.
 
     Каждое возвращаемое значение не имеет index и:
     - ЛИБО неполное выражение с лейблом, но без Opcode (когда в исходном коде лейбл отдельно от выражения)
@@ -354,36 +288,20 @@ def map_term_to_statement(
     - ЛИБО выражение с лейблом
     """
     statement_term: StatementTerm = StatementTerm(line=statement.line)
-    statement_term.label = match_label(statement)
+    statement_term.label = label
     # Убираем имя лейбла из выражения при наличии
     if statement_term.label is not None:
         del statement.terms[:2]
 
     statement_term.mode = select_remove_statement_mode(statement)
-    # Убираем символ косвенной адресации
-    match statement_term.mode:
-        case Mode.VALUE:
-            pass
-        case Mode.DIRECT:
-            statement.terms.remove("*")
-        case Mode.INDIRECT:
-            statement.terms.remove("*")
-            statement.terms.remove("*")
 
     instruction_name: str | None = statement.terms[0] if len(statement.terms) > 0 else None
     if instruction_name is not None:
-        statement_term.opcode = map_instruction_to_opcode(instruction_name) if instruction_name is not None else None
+        statement_term.opcode = _INSTRUCTION_TO_OPCODE.get(instruction_name)
         assert (
             statement_term.opcode is not None
         ), "Translation failed: instruction {} is not supported, line: {}".format(instruction_name, statement.line)
-        is_unary_operation: bool = statement_term.opcode in Opcode.unary_operations()
-        is_noop_operation: bool = statement_term.opcode in Opcode.no_operand_operations()
-        assert (
-            is_unary_operation ^ is_noop_operation
-        ), "Translation bug: ISA represents opcode '{}' incorrectly, line: {}".format(
-            statement_term.opcode, statement.line
-        )
-        if is_unary_operation:
+        if _IS_UNARY_OPERATION[statement_term.opcode]:
             statement_term.arg = statement.terms[1] if len(statement.terms) >= 2 else None
             assert (
                 statement_term.arg is not None
@@ -391,9 +309,9 @@ def map_term_to_statement(
             statement_term.arg = validate_unary_operation_argument(
                 statement_term, operation_labels, data_labels, interruption_handler_labels
             )
-        elif is_noop_operation:
+        else:
             assert (
-                is_noop_operation and len(statement.terms) == 1
+                len(statement.terms) == 1
             ), "Translation failed: instruction {} works without arguments, line: {}".format(
                 statement_term.opcode, statement.line
             )
@@ -415,16 +333,15 @@ def map_terms_to_statements(
     """
     operation_labels: set[str] = set()
     terms: list[StatementTerm] = []
-    # Находим все выражения с лейблами
-    for statement in text_section_terms:
-        cur_label: str | None = match_label(statement)
-        if cur_label is not None:
-            operation_labels.add(cur_label)
+    # Находим все выражения с лейблами: лейбл каждого выражения разбирается один раз.
+    # Отдельный проход нужен до разбора аргументов: переходы могут ссылаться на лейблы ниже по тексту
+    statement_labels: list[str | None] = [match_label(statement) for statement in text_section_terms]
+    operation_labels.update(label for label in statement_labels if label is not None)
 
     prev_label: str | None = None
-    for statement in text_section_terms:
+    for statement, label in zip(text_section_terms, statement_labels, strict=True):
         statement_term: StatementTerm = map_term_to_statement(
-            statement, operation_labels, data_labels, interruption_handler_labels
+            statement, label, operation_labels, data_labels, interruption_handler_labels
         )
         if prev_label is not None:
             assert (
@@ -442,18 +359,28 @@ def map_terms_to_statements(
 def map_literal_to_data_terms(data_term: DataTerm) -> list[DataTerm]:
     """Трансляция терма данных, представляющего п-сторку, в последовательность термов данных - символов с размером строки."""
     terms: list[DataTerm] = []
-    literal: str | list[int] = data_term.value if data_term.value is not None else [0] * data_term.size
+    literal: Iterable[str | int] = data_term.value if data_term.value is not None else repeat(0, data_term.size)
 
     # Терм данных с длиной всего литерала
     terms.append(DataTerm(label=data_term.label, value=data_term.size, line=data_term.line))
 
-    for index, elem in enumerate(literal, 1):
-        terms.append(
-            DataTerm(label="{}(+ {})".format(data_term.label, index), value=literal[index - 1], line=data_term.line)
-        )
+    # Термы символов литерала строятся за один проход, без повторного обращения к литералу по индексу
+    label: str | None = data_term.label
+    terms.extend(
+        DataTerm(label=f"{label}(+ {index})", value=elem, line=data_term.line) for index, elem in enumerate(literal, 1)
+    )
     return terms
 
 
+def validate_string_size(term: SourceTerm) -> int:
+    """Проверка размера строковых данных (третий терм объявления). Возвращает размер."""
+    data_size: int | None = try_convert_str_to_int(term.terms[2])
+    assert (
+        data_size is not None and data_size > 0
+    ), "Translation failed: data size should be non-negative integer value, line: {}".format(term.line)
+    return data_size
+
+
 def map_terms_to_data(data_section_terms: list[SourceTerm]) -> tuple[list[DataTerm], set[str]]:
     """Трансляция последовательности термов секции данных исходной программы в последовательность термов данных.
 
@@ -481,13 +408,6 @@ def map_terms_to_data(data_section_terms: list[SourceTerm]) -> tuple[list[DataTe
         data_terms: list[DataTerm] = []
         str_data_term: DataTerm | None = None
 
-        def validate_string_size(size_str: str) -> int:
-            data_size = try_convert_str_to_int(term.terms[2])
-            assert (
-                data_size is not None and data_size > 0
-            ), "Translation failed: data size should be non-negative integer value, line: {}".format(term.line)
-            return data_size
-
         match len(term.terms):
             case 2:  # Number declaration
                 data_terms.append(DataTerm(label=cur_label, value=value, size=data_size, line=term.line))
@@ -496,16 +416,16 @@ def map_terms_to_data(data_section_terms: list[SourceTerm]) -> tuple[list[DataTe
                 assert value is not None, "Translation failed: number defenition is not correct, line:{}".format(
                     term.line
                 )
-                assert value < 2**31 and value >= -(
-                    2**32
+                assert (
+                    -(2**31) <= value < 2**31
                 ), "Translation failed: number doesn't fit machine word, which is 4 bytes, line: {}".format(term.line)
                 data_terms.append(DataTerm(label=cur_label, value=value, size=data_size, line=term.line))
             case 4:  # String data declaration
-                data_size = validate_string_size(term.terms[2])
+                data_size = validate_string_size(term)
                 str_data_term = DataTerm(label=cur_label, value=value, size=data_size, line=term.line)
                 data_terms.extend(map_literal_to_data_terms(str_data_term))
             case 5:  # String data defenition
-                data_size = validate_string_size(term.terms[2])
+                data_size = validate_string_size(term)
                 assert (
                     try_convert_str_to_int(term.terms[4]) is None
                 ), "Translation failed: number shouldn't have length before it, line: {}".format(term.line)
@@ -538,8 +458,6 @@ def map_sections(
     - Словарь имён леблов данных и соответствующих им индексов памяти
     """
     code_list: list[StatementTerm | DataTerm] = []
-    statement_labels_addr: dict[str, int] = dict()
-    data_labels_addr: dict[str, int] = dict()
     programm_start: int | None = None
     for statement_pos, statement in enumerate(statement_terms):
         if statement.label is not None and statement.label == "_start":
@@ -548,22 +466,40 @@ def map_sections(
 
     assert programm_start is not None, "Translation failed: can not find programm start label."
 
+    # Сегменты памяти: вектор прерываний, инструкции начиная с _start, инструкции до _start, данные
+    text_terms: list[StatementTerm] = statement_terms[programm_start:] + statement_terms[:programm_start]
+    text_base: int = len(interruption_vector)
+    data_base: int = text_base + len(text_terms)
+
     code_list.extend(interruption_vector)
-    code_list.extend(statement_terms[programm_start:])
-    code_list.extend(statement_terms[:programm_start])
+    code_list.extend(text_terms)
     code_list.extend(data_terms)
-
-    term_index: int = 0
-    for term in code_list:
+    for term_index, term in enumerate(code_list):
         term.index = term_index
-        if isinstance(term, StatementTerm) and term.label is not None:
-            statement_labels_addr[term.label] = term_index
-        elif isinstance(term, DataTerm) and term.label is not None:
-            data_labels_addr[term.label] = term_index
-        term_index += 1
+
+    # Адреса лейблов вычисляются по смещению сегмента, тип терма проверяется только в векторе прерываний
+    statement_labels_addr: dict[str, int] = {
+        term.label: term_index
+        for term_index, term in enumerate(interruption_vector)
+        if isinstance(term, StatementTerm) and term.label is not None
+    } | {term.label: text_base + term_index for term_index, term in enumerate(text_terms) if term.label is not None}
+    data_labels_addr: dict[str, int] = {
+        term.label: term_index
+        for term_index, term in enumerate(interruption_vector)
+        if isinstance(term, DataTerm) and term.label is not None
+    } | {term.label: data_base + term_index for term_index, term in enumerate(data_terms) if term.label is not None}
     return (code_list, statement_labels_addr, data_labels_addr)
 
 
+def log_linked_code(contents: list[MachineWordData | MachineWordInstruction]) -> None:
+    """Построчный вывод слинкованного кода, только при включённом уровне DEBUG."""
+    if not logging.getLogger().isEnabledFor(logging.DEBUG):
+        return
+    logging.debug("Linked code:\n===========")
+    for term in contents:
+        logging.debug(term)
+
+
 def link_sections(
     code_list: list[StatementTerm | DataTerm], statement_labels_addr: dict[str, int], data_labels_addr: dict[str, int]
 ) -> Code:
@@ -580,35 +516,21 @@ def link_sections(
             contents.append(data)
 
         elif isinstance(term, StatementTerm):
-            instruction: MachineWordInstruction
-            arg: int
-            if term.opcode in Opcode.control_flow_operations():
-                arg = (
-                    statement_labels_addr[term.arg]
-                    if term.mode is Mode.VALUE and isinstance(term.arg, str)
-                    else term.arg
-                    if isinstance(term.arg, int)
-                    else data_labels_addr[term.arg]
-                )
-            elif term.opcode in Opcode.data_manipulation_operations() | Opcode.no_operand_operations():  # mb error
-                arg_data_label: int | None = data_labels_addr.get(term.arg)
-                arg_statement_label: int | None = statement_labels_addr.get(term.arg)
-                arg = (
-                    arg_data_label
-                    if arg_data_label is not None
-                    else arg_statement_label
-                    if arg_statement_label is not None
-                    else term.arg
-                )
-
-            instruction = MachineWordInstruction(
+            # Подстановка адреса нужна только аргументам-лейблам, числовые аргументы переносятся как есть
+            arg: int | str | None = term.arg
+            if isinstance(arg, str):
+                if term.opcode in _CONTROL_FLOW_OPERATIONS:
+                    # Переход по значению - на лейбл инструкции, косвенный переход - через лейбл данных
+                    arg = (statement_labels_addr if term.mode is Mode.VALUE else data_labels_addr)[arg]
+                else:
+                    arg = data_labels_addr[arg] if arg in data_labels_addr else statement_labels_addr.get(arg, arg)
+
+            instruction: MachineWordInstruction = MachineWordInstruction(
                 index=term.index, opcode=term.opcode, line=term.line, label=term.label, arg=arg, mode=term.mode
             )
             contents.append(instruction)
 
-    logging.debug("Linked code:\n===========")
-    for term in contents:
-        logging.debug(term)
+    log_linked_code(contents)
     return Code(contents)
 
 
@@ -625,21 +547,15 @@ def create_interruption_vector() -> tuple[list[DataTerm], set[str], set[str]]:
     - Множество лейблов вектора прерываний
     - Множество лейблов ячеек памяти для регистров.
     """
-    interruption_vector: list[DataTerm] = []
-    interruption_vector_labels: set[str] = set()
-    interruption_register_labels: set[str] = set()
+    # Лейблы вектора прерываний интернируются, как и лейблы исходного кода, ссылающиеся на них
+    vector_labels: list[str] = [sys.intern(f"int{index}") for index in range(get_interruption_vector_length())]
+    interruption_vector: list[DataTerm] = [DataTerm(label=label, value=10) for label in vector_labels]
+    interruption_vector_labels: set[str] = set(vector_labels)
+    interruption_register_labels: set[str] = {"int_acc", "int_pc", "int_default"}
 
-    for index in range(0, get_interruption_vector_length()):
-        if index < get_interruption_vector_length():
-            label: str = "int{}".format(index)
-            interruption_vector.append(DataTerm(label=label, value=10))
-            interruption_vector_labels.add(label)
     interruption_vector.append(DataTerm(label="int_acc", value=0))
     interruption_vector.append(DataTerm(label="int_pc", value=0))
     interruption_vector.append(StatementTerm(opcode=Opcode.FI, line=0))
-    interruption_register_labels.add("int_acc")
-    interruption_register_labels.add("int_pc")
-    interruption_register_labels.add("int_default")
     return (interruption_vector, interruption_vector_labels, interruption_register_labels)
 
 
@@ -651,8 +567,6 @@ def translate(code_text: str) -> Code:
     section_data: list[SourceTerm] | None = None
     section_text: list[SourceTerm] | None = None
 
-    code_labels: set[str] = set()
-    tmp_code_labels: set[str] = set()
     data_labels: set[str] = set()
 
     interruption_vector_labels: set[str] = set()
@@ -667,22 +581,19 @@ def translate(code_text: str) -> Code:
     source_terms: list[SourceTerm] = split_text_to_source_terms(code_text)
     sections: dict[str, list[SourceTerm]] = split_source_terms_to_sections(source_terms)
 
-    section_data = sections.get(".data")
+    section_data = sections.get(_SECTION_DATA)
     if section_data is not None:
         data_terms, data_labels = map_terms_to_data(section_data)
 
     interruption_vector, interruption_vector_labels, interruption_registers_labels = create_interruption_vector()
     data_labels.update(interruption_registers_labels)
 
-    section_text = sections.get(".text")
+    section_text = sections.get(_SECTION_TEXT)
     assert section_text is not None, "Translation failed: Section .text is not present in program"
-    statement_terms, tmp_code_labels = map_terms_to_statements(
+    statement_terms, _ = map_terms_to_statements(
         text_section_terms=section_text, data_labels=data_labels, interruption_handler_labels=interruption_vector_labels
     )
 
-    code_labels.update(interruption_vector_labels)
-    code_labels.update(tmp_code_labels)
-
     code_labels_addr: dict[str, int] = dict()
     data_labels_addr: dict[str, int] = dict()
 
@@ -701,7 +612,7 @@ def main(source_code_file_name: str, target_file_name: str) -> None:
 
     with open(source_code_file_name, encoding="utf-8") as f:
         source = f.read()
-        logging.debug("Source file: {}".format(source_code_file_name))
+        logging.debug("Source file: %s", source_code_file_name)
 
     try:
         code = translate(source)
@@ -711,7 +622,7 @@ def main(source_code_file_name: str, target_file_name: str) -> None:
         return
 
     write_code(target_file_name, code)
-    logging.info("source LoC: {} code instr: {}".format(len(source.split("\n")), len(code.contents)))
+    logging.info("source LoC: %s code instr: %s", source.count("\n") + 1, len(code.contents))
 
 
 if __name__ == "__main__":
@@ -2,20 +2,28 @@ import contextlib
 import io
 import logging
 import os
+import struct
 import tempfile
 
 import pytest
 import unittest
 
-from isa import read_code, write_code, MachineWordData, MachineWordInstruction, SourceTerm
+from isa import read_code, write_code, DataTerm, MachineWordData, MachineWordInstruction, Opcode, SourceTerm
 from translator import (
     validate_section_name,
+    split_source_terms_to_sections,
     map_terms_to_data,
+    map_literal_to_data_terms,
     match_label,
     split_text_to_source_terms,
     split_programm_line_to_terms,
+    split_literal_line_to_terms,
+    translate,
 )
-from machine import DataPath, ControlUnit, Machine, DataBus, InterruptionLine
+from machine import DataPath, ControlUnit, Machine, DataBus, InterruptionLine, IO, SCHEDULE_RECORD_FORMAT
+
+# Каталог примеров программ: путь не зависит от каталога, из которого запущены тесты
+EXAMPLES_DIR: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "examples")
 
 
 @pytest.mark.golden_test("golden_tests/unit/translator_validate_sections.yml")
@@ -173,3 +181,251 @@ def test_machine_alu(golden: str, caplog) -> None:
     reset_regs()
     alu.operation(mode=8)
     assert alu._output_buffer_register == golden.out["out_shift_right"]
+
+
+def test_machine_alu_invalid_mode() -> None:
+    """Код режима АЛУ вне таблицы режимов, в том числе отрицательный, отклоняется."""
+    alu: DataPath.ALU = DataPath.ALU()
+    for method, mode in [
+        (alu.negative, -1),
+        (alu.negative, 4),
+        (alu.inc, -1),
+        (alu.inc, 4),
+        (alu.dec, -4),
+        (alu.dec, 4),
+        (alu.operation, -9),
+        (alu.operation, 9),
+    ]:
+        with pytest.raises(ValueError):
+            method(mode)
+
+
+def test_machine_default_devices_not_shared() -> None:
+    """Устройства по умолчанию создаются для каждой машины и подключаются к её шине."""
+    first: Machine = Machine(memory_size=16)
+    second: Machine = Machine(memory_size=16)
+    first_console = first._io_controller._connected_devices[7]
+    second_console = second._io_controller._connected_devices[7]
+    assert first_console is not second_console
+    assert first_console._data_bus is first._data_bus
+    assert second_console._data_bus is second._data_bus
+
+
+def test_machine_console_flushes_own_output() -> None:
+    """Консоль по умолчанию перед вводом выводит несохранённый вывод своей машины, а не последней созданной."""
+    first: Machine = Machine(memory_size=16)
+    second: Machine = Machine(memory_size=16)
+    first._output_buffer.extend("ab")
+    console: IO.IODeviceConsole = first._io_controller._connected_devices[7]
+    assert console._before_input is not None
+    with contextlib.redirect_stdout(io.StringIO()) as stdout:
+        console._before_input()
+    assert stdout.getvalue() == "ab"
+    assert first._printed_output == 2 and second._printed_output == 0
+
+
+def test_translator_data_word_bounds() -> None:
+    """Числовые данные ограничены 32-битным знаковым машинным словом уже при трансляции."""
+    source: str = "section .data:\n    x: {}\nsection .text:\n_start:\n    hlt"
+    for value in [-(2**31), 2**31 - 1]:
+        code = translate(source.format(value))
+        assert any(isinstance(word, MachineWordData) and word.value == value for word in code.contents)
+        # Значение на границе машинного слова загружается в память модели без ошибки
+        DataPath(common_memory=code.contents, data_bus=DataBus())
+    for value in [-(2**31) - 1, 2**31, -3000000000]:
+        with pytest.raises(AssertionError) as e:
+            translate(source.format(value))
+        assert str(e.value) == "Translation failed: number doesn't fit machine word, which is 4 bytes, line: 2"
+
+
+def test_machine_tick_repr_address_out_of_memory() -> None:
+    """Состояние процессора выводится и при адресном регистре за пределами памяти."""
+    machine: Machine = Machine(memory_size=16)
+    machine._data_path._address_register = 16
+    assert "| MEM_AR: None |" in repr(machine._control_unit)
+
+
+def test_machine_binary_schedule() -> None:
+    """Бинарное расписание ввода разбирается так же, как текстовое."""
+    schedule: list[tuple[int, str]] = [(1, "c"), (100, "a"), (200, "t")]
+    schedule_bytes: bytes = b"".join(
+        struct.pack(SCHEDULE_RECORD_FORMAT, tick, ord(symbol)) for tick, symbol in schedule
+    )
+
+    assert Machine.parse_binary_schedule(schedule_bytes) == Machine.pack_schedule(schedule)
+    assert Machine.parse_binary_schedule(b"") == Machine.pack_schedule([])
+
+    with pytest.raises(ValueError, match="26 bytes"):
+        Machine.parse_binary_schedule(schedule_bytes[:-1])
+
+    # Такты во всём диапазоне массива тактов, в том числе со старшими байтами, разбираются без переполнения
+    wide_schedule: list[tuple[int, str]] = [(2**63 - 1, "z"), (-1, "\xff"), (2**40 + 7, "q")]
+    wide_bytes: bytes = b"".join(
+        struct.pack(SCHEDULE_RECORD_FORMAT, tick, ord(symbol)) for tick, symbol in wide_schedule
+    )
+    assert Machine.parse_binary_schedule(wide_bytes) == Machine.pack_schedule(wide_schedule)
+
+
+def test_machine_alu_word_overflow() -> None:
+    """Результат операции АЛУ переполняется как 32-битное знаковое машинное слово."""
+    alu: DataPath.ALU = DataPath.ALU()
+
+    alu._left_register, alu._right_register = 1, 2**31 - 1
+    alu.operation(mode=0)
+    assert alu._output_buffer_register == -(2**31)
+    assert alu._res_neg
+
+    alu._left_register, alu._right_register = 1, -(2**31)
+    alu.operation(mode=1)
+    assert alu._output_buffer_register == 2**31 - 1
+    assert not alu._res_neg
+
+    alu._left_register, alu._right_register = 0, 2**31
+    alu.operation(mode=7)
+    assert alu._output_buffer_register == 0
+    assert alu._res_zero
+
+    alu._left_register, alu._right_register = -(2**31), 0
+    alu.negative(mode=0)
+    alu.operation(mode=0)
+    assert alu._output_buffer_register == -(2**31)
+
+
+def test_machine_device_read_int() -> None:
+    """Чтение регистра прерывания устройства передаёт на шину 0/1."""
+    data_bus: DataBus = DataBus()
+    device: IO.IODeviceCommon = IO.IODeviceCommon(data_bus=data_bus)
+
+    device.signal_read_int()
+    assert data_bus.transmitting_value == 0
+
+    device._int_register = 1
+    device.signal_read_int()
+    assert data_bus.transmitting_value == 1
+    assert device._data_register == 1
+
+
+def test_machine_alu_control_word() -> None:
+    """Сигнал АЛУ принимает управляющее слово кортежем и обновляет флаги тракта данных."""
+    machine: Machine = Machine(memory_size=16, io_devices={})
+    control_unit: ControlUnit = machine._control_unit
+    data_path: DataPath = machine._data_path
+
+    data_path._accumulator_register, data_path._buffer_register = 5, 7
+    control_unit.signal_latch_arithmetical_logical_unit((2, 3, 3, 3, 1))
+    assert data_path._alu._output_buffer_register == -2
+    assert data_path.negative() and not data_path.zero()
+
+    control_unit.signal_latch_arithmetical_logical_unit((1, 3, 3, 1, 6))
+    assert data_path._alu._output_buffer_register == 4
+    assert not data_path.negative() and not data_path.zero()
+
+    # Отрицательный код режима в управляющем слове отклоняется, как и код вне таблицы режимов
+    with pytest.raises(ValueError):
+        control_unit.signal_latch_arithmetical_logical_unit((2, 3, 3, 3, -1))
+
+
+def test_machine_opcode_dispatch_is_total() -> None:
+    """Для каждого кода операции есть цикл исполнения: выбор обработчика выполняется при загрузке программы."""
+    assert set(ControlUnit._OPCODE_TABLE) == set(Opcode)
+
+
+def test_machine_fi_without_tick_trace() -> None:
+    """Возврат из прерывания без журналирования тактов даёт тот же результат и то же число тактов."""
+    with open(os.path.join(EXAMPLES_DIR, "cat.asm"), encoding="utf-8") as file:
+        source: str = file.read()
+    schedule: list[tuple[int, str]] = [(1, "c"), (100, "a"), (200, "t")]
+
+    results: list[tuple[str, int, int]] = []
+    for verbose in (True, False):
+        # Ячейки данных машинного кода изменяются при исполнении, поэтому код транслируется для каждого запуска
+        code = translate(source)
+        io_devices: dict[int, IO.IODeviceCommon] = {index: IO.IODeviceCommon() for index in [1, 2]}
+        machine: Machine = Machine(memory_size=len(code.contents), io_devices=io_devices)
+        machine.set_verbose(verbose)
+        with contextlib.redirect_stdout(io.StringIO()):
+            results.append(machine.simulation(code=code, input_schedule=schedule, limit=1000))
+
+    assert results[0] == results[1]
+
+
+def test_machine_unused_memory_words() -> None:
+    """Незанятые ячейки памяти имеют собственные индекс и метку, запись попадает только в свою ячейку."""
+    machine: Machine = Machine(memory_size=16, io_devices={})
+    data_path: DataPath = machine._data_path
+
+    data_path._address_register, data_path._accumulator_register = 15, 42
+    data_path._write_memory()
+    data_path.store_memory_values()
+
+    assert [(word.index, word.label) for word in machine._common_memory] == [(i, str(i)) for i in range(16)]
+    assert machine._common_memory[15].value == 42 and machine._common_memory[14].value == 0
+
+
+def test_translator_duplicate_sections() -> None:
+    """Повторное объявление секции с тем же именем отклоняется."""
+    terms: list[SourceTerm] = split_text_to_source_terms("section .data:\nsection .text:\nsection .data:")
+    with pytest.raises(AssertionError) as e:
+        split_source_terms_to_sections(terms)
+    assert str(e.value) == "Translation failed: Section name should be unique: 3."
+    assert split_source_terms_to_sections(terms[:2]) == {".data": [], ".text": []}
+
+
+def test_translator_section_contents() -> None:
+    """Термы попадают в последнюю объявленную перед ними секцию, термы до первого объявления отбрасываются."""
+    source: str = "x: 0\nsection .text:\nnop\nsection .data:\na: 1\nb: 2"
+    sections = split_source_terms_to_sections(split_text_to_source_terms(source))
+    assert list(sections) == [".text", ".data"]
+    assert [term.line for term in sections[".text"]] == [3]
+    assert [term.line for term in sections[".data"]] == [5, 6]
+    assert [term.terms for term in sections[".text"]] == [["nop"]]
+
+
+def test_translator_source_line_numbers() -> None:
+    """Строки исходного кода разделяются только по '\\n': прочие разделители строк остаются внутри литералов."""
+    terms: list[SourceTerm] = split_text_to_source_terms('a: 1\r\n\r\nb: 3, "x\x0cy z"\n')
+    assert [term.line for term in terms] == [1, 3]
+    assert terms[1].terms == ["b", ":", "3", ",", '"x\x0cy z"']
+
+
+def test_translator_line_tokenizer_literals() -> None:
+    """Разбор строки с литералами: ';' внутри литерала не начинает комментарий, литерал переносится в конец."""
+    assert split_programm_line_to_terms('msg: 4, "a;b "') == ["msg", ":", "4", ",", '"a;b "']
+    assert split_programm_line_to_terms('end: 10 ; "\\n" code') == ["end", ":", "10", '"\\n"']
+    assert split_programm_line_to_terms('x: 1, "ab') == ["x", ":", "1", ",", '"', "ab"]
+    assert split_programm_line_to_terms("ld *ptr ; comment, *") == ["ld", "*", "ptr"]
+    # Кавычки объединяются в литералы попарно слева направо, лишние литералы отбрасываются
+    assert split_programm_line_to_terms('a "b" "c') == ["a", '"', "c", '"b"']
+    assert split_programm_line_to_terms('s: 3, "x" "y"') == ["s", ":", "3", ",", '"x"']
+
+
+def test_translator_silent_without_debug(capsys, caplog) -> None:
+    """Трансляция без отладочного журналирования ничего не выводит: ни в stdout, ни в журнал."""
+    with open(os.path.join(EXAMPLES_DIR, "hello_user_name.asm"), encoding="utf-8") as file:
+        source: str = file.read()
+    caplog.set_level(logging.INFO)
+    translate(source)
+    assert capsys.readouterr().out == ""
+    assert caplog.records == []
+
+
+def test_translator_literal_data_terms() -> None:
+    """Строка раскладывается в ячейку с длиной и ячейки символов с лейблами-смещениями, буфер - в нулевые ячейки."""
+    terms: list[DataTerm] = map_literal_to_data_terms(DataTerm(label="msg", value="hi", size=2, line=3))
+    assert [(term.label, term.value, term.line) for term in terms] == [
+        ("msg", 2, 3),
+        ("msg(+ 1)", "h", 3),
+        ("msg(+ 2)", "i", 3),
+    ]
+    terms = map_literal_to_data_terms(DataTerm(label="buf", value=None, size=2, line=4))
+    assert [(term.label, term.value) for term in terms] == [("buf", 2), ("buf(+ 1)", 0), ("buf(+ 2)", 0)]
+
+
+def test_translator_line_tokenizer_fast_path() -> None:
+    """Разбор строки без литералов одним findall совпадает с общим разбором строки по термам."""
+    lines: list[str] = ["  ld\t*ptr,1 ;x:y", "a:b,c*d", "", " ; only comment", "st  int1"]
+    for name in ["cat.asm", "hello.asm", "hello_user_name.asm", "prob.asm"]:
+        with open(os.path.join(EXAMPLES_DIR, name), encoding="utf-8") as file:
+            lines.extend(line for line in file.read().split("\n") if '"' not in line)
+    for line in lines:
+        assert split_programm_line_to_terms(line) == split_literal_line_to_terms(line), line